@@ -1,16 +1,25 @@
 from flask import Flask, render_template, send_from_directory
-from app.models import db
+from app.models import db, Case, Document
 from app.routes import api_bp
+from app.commands import register_commands
+from app.json_provider import FastJSONProvider
+from app.compression import init_compression
+from app.db_routing import init_replica_routing
+from app.rate_limit import init_rate_limiting
 from config import config
 import os
+from pathlib import Path
 
 
-def create_app(config_name='default'):
+def create_app(config_name='default', config_overrides=None):
     """Application factory"""
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Load config
     app.config.from_object(config[config_name])
+    if config_overrides:
+        app.config.update(config_overrides)
     
     # Ensure instance folder exists
     instance_path = app.config.get('LOCAL_STORAGE_PATH')
@@ -19,10 +28,16 @@ def create_app(config_name='default'):
     
     # Initialize extensions
     db.init_app(app)
+    init_rate_limiting(app)
+    init_replica_routing(app, db)
+    init_compression(app)
     
     # Register blueprints
     app.register_blueprint(api_bp)
     
+    # Register CLI commands
+    register_commands(app)
+    
     # Main routes
     @app.route('/')
     def index():
@@ -41,8 +56,13 @@ def create_app(config_name='default'):
     
     @app.route('/storage/<path:filename>')
     def serve_storage(filename):
-        """Serve files from local storage"""
+        """Serve files from local storage (only files of live documents)"""
         storage_path = app.config.get('LOCAL_STORAGE_PATH')
+        Document.query.join(Case).filter(
+            Document.local_path == str(Path(storage_path) / filename),
+            Document.deleted_at.is_(None),
+            Case.deleted_at.is_(None)
+        ).first_or_404()
         return send_from_directory(storage_path, filename)
     
     # Create database tables
@@ -0,0 +1,154 @@
+import json
+import os
+import zipfile
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+# Formats that are already compressed; deflating them again only burns CPU
+STORED_EXTENSIONS = {
+    '.pdf', '.xlsx', '.xlsm', '.docx', '.pptx', '.zip', '.rar', '.7z', '.gz', '.zst',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.mp4', '.mov', '.mp3'
+}
+STORED_MIME_PREFIXES = ('image/', 'video/', 'audio/')
+
+COPY_CHUNK_SIZE = 256 * 1024
+
+
+class _StreamSink:
+    """
+    Write-only, non-seekable file object for ZipFile
+    Collects written bytes until the generator drains them
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def is_precompressed(filename: str, mime_type: Optional[str] = None) -> bool:
+    """Whether the file format is already compressed"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in STORED_EXTENSIONS:
+        return True
+    return bool(mime_type and mime_type.startswith(STORED_MIME_PREFIXES))
+
+
+def compress_type_for(filename: str, mime_type: Optional[str] = None) -> int:
+    """Pick ZIP_STORED for already-compressed formats, ZIP_DEFLATED otherwise"""
+    if is_precompressed(filename, mime_type):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _zip_info(name: str, when: Optional[datetime], compress_type: int) -> zipfile.ZipInfo:
+    when = when or datetime.utcnow()
+    # ZIP timestamps cannot predate 1980
+    info = zipfile.ZipInfo(name, date_time=max(when, datetime(1980, 1, 1)).timetuple()[:6])
+    info.compress_type = compress_type
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _unique_name(name: str, used: set) -> str:
+    if name not in used:
+        used.add(name)
+        return name
+    base, ext = os.path.splitext(name)
+    index = 2
+    while f"{base}_{index}{ext}" in used:
+        index += 1
+    name = f"{base}_{index}{ext}"
+    used.add(name)
+    return name
+
+
+def stream_case_archive(cases: Iterable, sp_service, prefix_case_folder: bool = False) -> Iterator[bytes]:
+    """
+    Build a ZIP archive on the fly and yield it in chunks
+    Each case contributes its documents, the generated Excel template and
+    a manifest.json with the status history. Nothing is written to disk and
+    at most one copy chunk is buffered at a time.
+    """
+    return (chunk for chunk in _iter_archive(cases, sp_service, prefix_case_folder) if chunk)
+
+
+def _iter_archive(cases: Iterable, sp_service, prefix_case_folder: bool) -> Iterator[bytes]:
+    sink = _StreamSink()
+
+    with zipfile.ZipFile(sink, mode='w', allowZip64=True) as zf:
+        for case in cases:
+            folder = f"{case.case_number}/" if prefix_case_folder else ''
+            used_names = set()
+            manifest_documents = []
+
+            for document in case.documents:
+                entry_name = _unique_name(f"{folder}documents/{document.filename}", used_names)
+                record = document.to_dict()
+                record['archive_path'] = entry_name
+
+                if not (document.sharepoint_path or document.local_path):
+                    record['archived'] = False
+                    record['error'] = 'No storage path'
+                    manifest_documents.append(record)
+                    continue
+
+                info = _zip_info(entry_name, document.uploaded_at,
+                                 compress_type_for(document.filename, document.mime_type))
+                try:
+                    chunks = sp_service.iter_document(document, COPY_CHUNK_SIZE)
+                    # Open the entry only once the source is readable
+                    first = next(chunks, b'')
+                    with zf.open(info, mode='w') as entry:
+                        entry.write(first)
+                        yield sink.drain()
+                        for chunk in chunks:
+                            entry.write(chunk)
+                            yield sink.drain()
+                    record['archived'] = True
+                except (IOError, OSError) as e:
+                    record['archived'] = False
+                    record['error'] = str(e)
+                manifest_documents.append(record)
+                yield sink.drain()
+
+            from app.excel_template import create_procurement_template
+            template = create_procurement_template(case.case_number, case.title or '')
+            zf.writestr(
+                _zip_info(f"{folder}{case.case_number}_procurement_request.xlsx", None, zipfile.ZIP_STORED),
+                template.getvalue()
+            )
+            yield sink.drain()
+
+            manifest = {
+                'case': case.to_dict(),
+                'status_history': [h.to_dict() for h in
+                                   sorted(case.status_history, key=lambda x: x.changed_at)],
+                'documents': manifest_documents,
+                'generated_at': datetime.utcnow().isoformat()
+            }
+            zf.writestr(
+                _zip_info(f"{folder}manifest.json", None, zipfile.ZIP_DEFLATED),
+                json.dumps(manifest, ensure_ascii=False, indent=2)
+            )
+            yield sink.drain()
+
+    # Central directory is written on close
+    yield sink.drain()
+
+
+def archive_filename(case_numbers: List[str]) -> str:
+    """Download name for an archive of one or more cases"""
+    if len(case_numbers) == 1:
+        return f"{case_numbers[0]}_archive.zip"
+    return f"CDC-PR_archive_{datetime.now().strftime('%Y%m%d%H%M%S')}.zip"
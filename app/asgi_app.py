@@ -0,0 +1,232 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from werkzeug.utils import secure_filename
+from a2wsgi import WSGIMiddleware
+
+from app.async_storage import AsyncSharePointClient
+from app.db_routing import REPLICA_BIND, PRIMARY_PIN_COOKIE
+from app.rate_limit import client_id_from, shed_message
+from app.integrity import AsyncHashingReader
+from app.models import db, Case
+from app.routes import (generate_case_number, check_document_type, add_case,
+                        add_document, find_cross_case_duplicates)
+
+
+class _BodyTooLarge(Exception):
+    """Request body grew past MAX_CONTENT_LENGTH while being read"""
+
+
+def _limit_body(request, max_size: int):
+    """
+    Same request with a receive channel that counts body bytes
+    Covers chunked uploads that send no (or a false) Content-Length.
+    """
+    received = 0
+
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message['type'] == 'http.request':
+            received += len(message.get('body', b''))
+            if received > max_size:
+                raise _BodyTooLarge()
+        return message
+
+    return Request(request.scope, receive)
+
+
+def create_asgi_app(flask_app, storage_client=None):
+    """
+    ASGI entry point
+    Storage-bound endpoints (case creation, document upload) are served
+    asynchronously so one worker can overlap many in-flight SharePoint calls;
+    every other route is delegated to the Flask app.
+    Database work runs in the thread pool inside a Flask app context.
+    """
+    storage = storage_client or AsyncSharePointClient(flask_app.config)
+    # Case numbers are derived from a count, so allocate them one at a time
+    case_number_lock = asyncio.Lock()
+    # Shared with the Flask routes mounted below (same process)
+    admission = flask_app.extensions.get('admission_controller')
+    trust_proxy = flask_app.config.get('RATE_LIMIT_TRUST_PROXY', False)
+
+    def in_app_context(func, *args):
+        def call():
+            with flask_app.app_context():
+                try:
+                    return func(*args)
+                except Exception:
+                    db.session.rollback()
+                    raise
+        return run_in_threadpool(call)
+
+    def error_response(message, status_code):
+        return JSONResponse({'success': False, 'error': message}, status_code=status_code)
+
+    def written_response(payload):
+        # Same read-your-writes pin as the Flask after_request hook
+        response = JSONResponse(payload, status_code=201)
+        if REPLICA_BIND in flask_app.config.get('SQLALCHEMY_BINDS', {}):
+            pin_seconds = flask_app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10)
+            response.set_cookie(PRIMARY_PIN_COOKIE, str(time.time() + pin_seconds),
+                                max_age=pin_seconds, httponly=True, samesite='lax')
+        return response
+
+    def _reserve_case(title, notes):
+        case = add_case(generate_case_number(), title, notes, None)
+        db.session.commit()
+        return case.id, case.case_number
+
+    def _finish_case(case_id, folder_path):
+        case = db.session.get(Case, case_id)
+        case.sharepoint_folder_path = folder_path
+        db.session.commit()
+        return case.to_dict()
+
+    def _discard_case(case_id):
+        case = db.session.get(Case, case_id)
+        if case is not None:
+            db.session.delete(case)
+            db.session.commit()
+
+    async def create_case(request):
+        """
+        Create a new case (async)
+        POST /api/cases
+        Body: {title: string, notes: string}
+        """
+        try:
+            data = await request.json()
+            title = (data.get('title') or '').strip()
+            notes = (data.get('notes') or '').strip()
+
+            # Insert first so the number is taken before the slow folder call
+            async with case_number_lock:
+                case_id, case_number = await in_app_context(_reserve_case, title, notes)
+
+            success, folder_path = await storage.create_case_folder(case_number)
+            if not success:
+                await in_app_context(_discard_case, case_id)
+                return error_response(f'Failed to create folder: {folder_path}', 500)
+
+            case = await in_app_context(_finish_case, case_id, folder_path)
+
+            return written_response({
+                'success': True,
+                'case': case,
+                'message': f'Case {case_number} created successfully'
+            })
+        except Exception as e:
+            return error_response(str(e), 500)
+
+    def _check_upload(case_id, doc_type):
+        case = db.session.get(Case, case_id)
+        if case is None or case.deleted_at is not None:
+            return None, 'Case not found'
+        return case.case_number, check_document_type(case_id, doc_type)
+
+    def _record_document(case_id, doc_type, safe_filename, original_filename, file_size,
+                         mime_type, sha256, file_path, notes):
+        case = db.session.get(Case, case_id)
+        document = add_document(case, doc_type, safe_filename, original_filename, file_size,
+                                mime_type, sha256, file_path, storage.sharepoint_enabled, notes)
+        db.session.commit()
+        return document.to_dict(), [d.to_dict() for d in find_cross_case_duplicates(document)]
+
+    async def upload_document(request):
+        """
+        Upload a document to a case (async)
+        POST /api/cases/{id}/documents
+        Form data: file (required), doc_type (main/attachment), notes (optional)
+        """
+        slot = None
+        if admission is not None:
+            client_id = client_id_from(request.client.host if request.client else None,
+                                       request.headers.get('x-forwarded-for'), trust_proxy)
+            status_code, retry_after = admission.try_acquire(client_id, 'async_uploads')
+            if status_code:
+                response = error_response(shed_message(status_code), status_code)
+                response.headers['Retry-After'] = str(retry_after)
+                return response
+            slot = (client_id, 'async_uploads')
+
+        form = None
+        try:
+            case_id = request.path_params['case_id']
+
+            max_size = flask_app.config.get('MAX_CONTENT_LENGTH')
+            if max_size:
+                content_length = request.headers.get('content-length')
+                if content_length and int(content_length) > max_size:
+                    return error_response('File too large', 413)
+                request = _limit_body(request, max_size)
+
+            form = await request.form()
+
+            file = form.get('file')
+            if file is None or isinstance(file, str):
+                return error_response('No file provided', 400)
+            if not file.filename:
+                return error_response('No file selected', 400)
+
+            doc_type = form.get('doc_type', 'attachment')
+            notes = (form.get('notes') or '').strip()
+
+            case_number, error = await in_app_context(_check_upload, case_id, doc_type)
+            if case_number is None:
+                return error_response(error, 404)
+            if error:
+                return error_response(error, 400)
+
+            original_filename = file.filename
+            safe_filename = secure_filename(original_filename)
+            if not safe_filename:
+                return error_response('Invalid filename. Please use ASCII characters.', 400)
+
+            # Hash while the upload is streamed to storage
+            reader = AsyncHashingReader(file.file)
+            success, file_path, error = await storage.upload_file(case_number, reader, safe_filename)
+            if not success:
+                return error_response(error or 'Failed to upload file', 500)
+
+            document, duplicates = await in_app_context(
+                _record_document, case_id, doc_type, safe_filename, original_filename,
+                file.size, file.content_type, reader.hexdigest(), file_path, notes
+            )
+
+            return written_response({
+                'success': True,
+                'document': document,
+                'duplicates': duplicates,
+                'message': 'Document uploaded successfully'
+            })
+        except _BodyTooLarge:
+            return error_response('File too large', 413)
+        except Exception as e:
+            return error_response(str(e), 500)
+        finally:
+            if form is not None:
+                await form.close()
+            if slot is not None:
+                admission.release(*slot)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await storage.aclose()
+
+    return Starlette(
+        routes=[
+            Route('/api/cases', create_case, methods=['POST']),
+            Route('/api/cases/{case_id:int}/documents', upload_document, methods=['POST']),
+            Mount('/', app=WSGIMiddleware(flask_app))
+        ],
+        lifespan=lifespan
+    )
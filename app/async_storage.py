@@ -0,0 +1,161 @@
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import quote
+
+from werkzeug.datastructures import FileStorage
+from werkzeug.utils import secure_filename
+
+from app.sharepoint_service import SharePointService, SHAREPOINT_AVAILABLE, load_sharepoint_client
+
+# Try to import httpx (optional dependency)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class AsyncSharePointClient:
+    """
+    Async SharePoint REST client with bounded concurrency
+    Mirrors SharePointService.create_case_folder/upload_file, including the
+    fallback to local storage (which runs in a worker thread)
+    """
+
+    def __init__(self, config, auth_provider: Optional[Callable[[], Dict[str, str]]] = None):
+        self.config = config
+        self.site_url = config.get('SHAREPOINT_SITE_URL', '').rstrip('/')
+        self.username = config.get('SHAREPOINT_USERNAME', '')
+        self.password = config.get('SHAREPOINT_PASSWORD', '')
+        self.root_folder = config.get('SHAREPOINT_ROOT_FOLDER', 'CDC-PR-Cases')
+        self.local = SharePointService(config)
+        self.auth_provider = auth_provider or self._acquire_auth_headers
+
+        self.sharepoint_enabled = self.local.sharepoint_enabled and HTTPX_AVAILABLE
+        self.semaphore = asyncio.Semaphore(config.get('ASYNC_STORAGE_CONCURRENCY', 100))
+        self.auth_ttl = config.get('SHAREPOINT_AUTH_TTL', 1800)
+
+        self._client = None
+        self._auth_headers = None
+        self._auth_expires = 0.0
+        self._digest = None
+        self._digest_expires = 0.0
+        self._auth_lock = asyncio.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.config.get('SHAREPOINT_TIMEOUT', 60),
+                limits=httpx.Limits(max_connections=self.config.get('ASYNC_STORAGE_CONCURRENCY', 100))
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def create_case_folder(self, case_number: str) -> Tuple[bool, str]:
+        """
+        Create a folder for the case
+        Returns: (success, folder_path)
+        """
+        if not self.sharepoint_enabled:
+            return await asyncio.to_thread(self.local._create_local_folder, case_number)
+
+        folder_url = f"Shared Documents/{self.root_folder}/{case_number}"
+        try:
+            async with self.semaphore:
+                await self._post(f"/_api/web/folders/add('{quote(folder_url)}')")
+            return True, folder_url
+        except Exception as e:
+            # Fall back to local storage on error
+            print(f"SharePoint error: {e}, falling back to local storage", flush=True)
+            return await asyncio.to_thread(self.local._create_local_folder, case_number)
+
+    async def upload_file(self, case_number: str, file, filename: str) -> Tuple[bool, str, Optional[str]]:
+        """
+        Upload a file to the case folder
+        file must provide async read()/seek() and a sync .file stream
+        Returns: (success, file_path, error_message)
+        """
+        safe_filename = secure_filename(filename)
+
+        if not self.sharepoint_enabled:
+            return await self._upload_to_local(case_number, file, safe_filename)
+
+        folder_url = f"Shared Documents/{self.root_folder}/{case_number}"
+
+        async def body():
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+        try:
+            async with self.semaphore:
+                await self._post(
+                    f"/_api/web/GetFolderByServerRelativeUrl('{quote(folder_url)}')"
+                    f"/Files/add(url='{quote(safe_filename)}',overwrite=true)",
+                    content=body()
+                )
+            return True, f"{folder_url}/{safe_filename}", None
+        except Exception as e:
+            # Fall back to local storage on error
+            print(f"SharePoint upload error: {e}, falling back to local storage", flush=True)
+            await file.seek(0)  # Reset file pointer
+            return await self._upload_to_local(case_number, file, safe_filename)
+
+    async def _upload_to_local(self, case_number: str, file, filename: str) -> Tuple[bool, str, Optional[str]]:
+        storage = FileStorage(stream=file.file, filename=filename)
+        return await asyncio.to_thread(self.local._upload_to_local, case_number, storage, filename)
+
+    async def _post(self, path: str, content=None):
+        headers = dict(await self._get_auth_headers())
+        headers['Accept'] = 'application/json;odata=nometadata'
+        headers['X-RequestDigest'] = await self._get_request_digest(headers)
+
+        response = await self.client.post(f"{self.site_url}{path}", headers=headers, content=content)
+        response.raise_for_status()
+        return response
+
+    async def _get_auth_headers(self) -> Dict[str, str]:
+        """Authentication headers, acquired in a worker thread and cached"""
+        if self._auth_headers is None or time.monotonic() > self._auth_expires:
+            async with self._auth_lock:
+                if self._auth_headers is None or time.monotonic() > self._auth_expires:
+                    self._auth_headers = await asyncio.to_thread(self.auth_provider)
+                    self._auth_expires = time.monotonic() + self.auth_ttl
+        return self._auth_headers
+
+    async def _get_request_digest(self, auth_headers: Dict[str, str]) -> str:
+        """Form digest required by SharePoint for write requests (cached)"""
+        if self._digest is None or time.monotonic() > self._digest_expires:
+            response = await self.client.post(f"{self.site_url}/_api/contextinfo", headers=auth_headers)
+            response.raise_for_status()
+            info = response.json()
+            self._digest = info['FormDigestValue']
+            # Refresh a minute before SharePoint expires it
+            self._digest_expires = time.monotonic() + max(int(info.get('FormDigestTimeoutSeconds', 1800)) - 60, 0)
+        return self._digest
+
+    def _acquire_auth_headers(self) -> Dict[str, str]:
+        """Log in with the configured user (blocking, office365 client)"""
+        if not SHAREPOINT_AVAILABLE:
+            raise IOError("SharePoint client library is not installed")
+
+        AuthenticationContext, _ = load_sharepoint_client()
+        from office365.runtime.http.request_options import RequestOptions
+
+        ctx_auth = AuthenticationContext(self.site_url)
+        if not ctx_auth.acquire_token_for_user(self.username, self.password):
+            raise IOError("SharePoint authentication failed")
+
+        request = RequestOptions(self.site_url)
+        ctx_auth.authenticate_request(request)
+        return dict(request.headers)
@@ -0,0 +1,389 @@
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.models import db
+from app.storage_tiering import tier_cold_documents, storage_report
+from app.sharepoint_service import SharePointService
+from app.integrity import scrub_documents
+from app.retention import purge_deleted
+from app.compression import BROTLI_AVAILABLE, compress_body
+from app.json_provider import ORJSON_AVAILABLE
+
+
+def format_bytes(size: int) -> str:
+    """Human readable byte count"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+@click.command('tier-cold-documents')
+@click.option('--days', type=int, default=None, help='Closed for more than N days (default: COLD_TIER_AFTER_DAYS)')
+@click.option('--limit', type=int, default=None, help='Maximum number of documents to process')
+@click.option('--dry-run', is_flag=True, help='Only report what would be compressed')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+@with_appcontext
+def tier_cold_documents_command(days, limit, dry_run, as_json):
+    """Compress documents of long-closed cases into the cold tier"""
+    report = tier_cold_documents(current_app.config, days, dry_run, limit)
+    
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+        return
+    
+    click.echo(f"Candidates:            {report['candidates']}")
+    click.echo(f"Eligible:              {report['eligible']} ({format_bytes(report['bytes_eligible'])})")
+    click.echo(f"Compressed:            {report['compressed']}")
+    click.echo(f"Skipped (compressed):  {report['skipped_precompressed']}")
+    click.echo(f"Skipped (low ratio):   {report['skipped_low_ratio']}")
+    click.echo(f"Missing files:         {report['missing']}")
+    click.echo(f"Errors:                {report['errors']}")
+    click.echo(f"Bytes reclaimed:       {format_bytes(report['bytes_reclaimed'])}")
+    if dry_run:
+        click.echo("(dry run - nothing was changed)")
+
+
+@click.command('storage-report')
+@with_appcontext
+def storage_report_command():
+    """Show stored bytes per storage tier"""
+    report = storage_report()
+    
+    for tier, stats in report['tiers'].items():
+        click.echo(f"{tier:6} {stats['documents']:8} docs  "
+                   f"{format_bytes(stats['bytes_original']):>10} -> {format_bytes(stats['bytes_stored']):>10}")
+    click.echo(f"Bytes reclaimed: {format_bytes(report['bytes_reclaimed'])}")
+
+
+@click.command('scrub-documents')
+@click.option('--workers', type=int, default=None, help='Parallel readers (default: SCRUB_WORKERS)')
+@click.option('--max-mb-per-sec', type=float, default=None,
+              help='Total read rate limit in MB/s, 0 for unlimited (default: SCRUB_MAX_MB_PER_SEC)')
+@click.option('--backfill', is_flag=True, help='Also hash documents that have no SHA-256 yet and store it')
+@with_appcontext
+def scrub_documents_command(workers, max_mb_per_sec, backfill):
+    """Re-verify stored documents against their SHA-256"""
+    config = current_app.config
+    workers = workers or config.get('SCRUB_WORKERS', 2)
+    if max_mb_per_sec is None:
+        max_mb_per_sec = config.get('SCRUB_MAX_MB_PER_SEC', 20)
+    bytes_per_second = int(max_mb_per_sec * 1024 * 1024) or None
+    
+    counts = {'ok': 0, 'backfilled': 0, 'mismatch': 0, 'missing': 0}
+    total_bytes = 0
+    
+    for result in scrub_documents(SharePointService(config), workers, bytes_per_second, backfill):
+        counts[result['status']] += 1
+        total_bytes += result.get('size', 0)
+        if result['status'] == 'mismatch':
+            click.echo(f"MISMATCH document {result['id']}: expected {result['expected']}, got {result['actual']}")
+        elif result['status'] == 'missing':
+            click.echo(f"MISSING  document {result['id']}: {result['error']}")
+    
+    click.echo(f"Verified: {counts['ok']}, backfilled: {counts['backfilled']}, "
+               f"mismatched: {counts['mismatch']}, missing: {counts['missing']} "
+               f"({format_bytes(total_bytes)} read)")
+    
+    if counts['mismatch'] or counts['missing']:
+        raise SystemExit(1)
+
+
+@click.command('purge-deleted')
+@click.option('--days', type=int, default=None, help='Deleted more than N days ago (default: DELETED_RETENTION_DAYS)')
+@click.option('--batch-size', type=int, default=None, help='Rows per DELETE transaction (default: PURGE_BATCH_SIZE)')
+@click.option('--workers', type=int, default=None, help='Parallel storage deletions (default: PURGE_WORKERS)')
+@click.option('--dry-run', is_flag=True, help='Only report what would be purged')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+@with_appcontext
+def purge_deleted_command(days, batch_size, workers, dry_run, as_json):
+    """Permanently remove soft-deleted cases/documents past the retention period"""
+    report = purge_deleted(current_app.config, days, batch_size, workers, dry_run)
+    
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+        return
+    
+    click.echo(f"Documents purged:      {report['documents']}")
+    click.echo(f"Cases purged:          {report['cases']}")
+    click.echo(f"File errors:           {report['file_errors']}")
+    click.echo(f"Bytes reclaimed:       {format_bytes(report['bytes_reclaimed'])}")
+    if dry_run:
+        click.echo("(dry run - nothing was changed)")
+    
+    if report['file_errors']:
+        raise SystemExit(1)
+
+
+def _sample_cases(count: int) -> list:
+    """Synthetic /api/cases rows shaped like Case.to_dict()"""
+    start = datetime(2025, 1, 1, 8, 30, 15, 123456)
+    statuses = ['Draft', 'Submitted', 'Approved', 'Closed', 'Rejected']
+    return [{
+        'id': i,
+        'case_number': f"CDC-PR-2025-{i:05d}",
+        'title': f"辦公設備採購 Office equipment #{i}",
+        'current_status': statuses[i % len(statuses)],
+        'sharepoint_folder_path': f"Shared Documents/CDC-PR-Cases/CDC-PR-2025-{i:05d}",
+        'created_at': (start + timedelta(minutes=i)).isoformat(),
+        'updated_at': (start + timedelta(minutes=i, seconds=37)).isoformat(),
+        'notes': 'Quarterly replacement' if i % 3 else '',
+        'document_count': i % 7,
+        'main_document_exists': bool(i % 2)
+    } for i in range(1, count + 1)]
+
+
+def _time_per_call(func, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) / repeat
+
+
+@click.command('bench-payloads')
+@click.option('--repeat', type=int, default=200, help='Serializations per measurement')
+@with_appcontext
+def bench_payloads_command(repeat):
+    """Benchmark /api/cases payload size on the wire and serialization CPU"""
+    from app.routes import to_columnar
+    
+    config = current_app.config
+    provider = current_app.json
+    encoders = [('json', lambda obj: json.dumps(obj, ensure_ascii=True, sort_keys=True).encode('utf-8'))]
+    if ORJSON_AVAILABLE:
+        encoders.append(('orjson', lambda obj: provider.dumps(obj).encode('utf-8')))
+    encodings = ['gzip'] + (['br'] if BROTLI_AVAILABLE else [])
+    
+    click.echo(f"{'rows':>5} {'format':9} {'encoder':7} {'ms/call':>8} {'raw':>10} "
+               + ' '.join(f"{e:>10}" for e in encodings))
+    for count in (100, 1000):
+        rows = _sample_cases(count)
+        payloads = {
+            'rows': {'success': True, 'cases': rows, 'total': count},
+            'columnar': {'success': True, 'total': count,
+                         'cases': to_columnar([dict(r) for r in rows], ('created_at', 'updated_at'))}
+        }
+        for fmt, payload in payloads.items():
+            for name, encode in encoders:
+                cpu = _time_per_call(lambda: encode(payload), repeat)
+                body = encode(payload)
+                sizes = ' '.join(f"{len(compress_body(body, e, config)):>10}" for e in encodings)
+                click.echo(f"{count:>5} {fmt:9} {name:7} {cpu * 1000:8.3f} {len(body):>10} {sizes}")
+
+
+def _start_fake_sharepoint(latency: float) -> str:
+    """Run the fake SharePoint server in a background thread, return its URL"""
+    import uvicorn
+    from app.fake_sharepoint import create_fake_sharepoint_app
+    
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    
+    server = uvicorn.Server(uvicorn.Config(
+        create_fake_sharepoint_app(latency), host='127.0.0.1', port=port, log_level='warning'
+    ))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def _run_storage_load(asgi_app, total: int, payload: bytes) -> dict:
+    """Fire total case creations, then total uploads, all at once"""
+    import httpx
+    
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=600) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post('/api/cases', json={'title': f'load test {i}'}) for i in range(total)
+        ])
+        create_seconds = time.perf_counter() - start
+        case_ids = [r.json()['case']['id'] for r in responses if r.status_code == 201]
+        
+        start = time.perf_counter()
+        uploads = await asyncio.gather(*[
+            client.post(f'/api/cases/{case_id}/documents',
+                        data={'doc_type': 'attachment'},
+                        files={'file': ('load.bin', payload, 'application/octet-stream')})
+            for case_id in case_ids
+        ])
+        upload_seconds = time.perf_counter() - start
+    
+    return {
+        'created': len(case_ids),
+        'create_seconds': create_seconds,
+        'uploaded': sum(1 for r in uploads if r.status_code == 201),
+        'upload_seconds': upload_seconds
+    }
+
+
+@click.command('bench-storage-concurrency')
+@click.option('--requests', 'total', type=int, default=200, help='Case creations and uploads per run')
+@click.option('--latency', type=float, default=0.2, help='Fake SharePoint latency per call (seconds)')
+@click.option('--levels', default='1,10,100', help='ASYNC_STORAGE_CONCURRENCY values to compare')
+@click.option('--payload-kb', type=int, default=64, help='Upload size in KB')
+def bench_storage_concurrency_command(total, latency, levels, payload_kb):
+    """Load test the async storage endpoints against a local fake SharePoint"""
+    from app import create_app
+    from app.asgi_app import create_asgi_app
+    from app.async_storage import AsyncSharePointClient
+    
+    site_url = _start_fake_sharepoint(latency)
+    payload = os.urandom(payload_kb * 1024)
+    click.echo(f"Fake SharePoint at {site_url}, {latency * 1000:.0f} ms per call, {total} requests per phase")
+    click.echo("Concurrency 1 is the baseline of one sync worker serving storage calls one at a time")
+    click.echo(f"{'concurrency':>11} {'created':>8} {'cases/s':>9} {'uploaded':>9} {'uploads/s':>10}")
+    
+    for level in [int(v) for v in levels.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp:
+            flask_app = create_app(os.getenv('FLASK_ENV', 'default'), {
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp}/bench.db",
+                'SQLALCHEMY_BINDS': {},
+                'RATE_LIMIT_ENABLED': False,
+                'LOCAL_STORAGE_PATH': os.path.join(tmp, 'storage'),
+                'UPLOAD_STAGING_PATH': os.path.join(tmp, 'uploads'),
+                'SHAREPOINT_SITE_URL': site_url,
+                'SHAREPOINT_USERNAME': 'bench',
+                'SHAREPOINT_PASSWORD': 'bench',
+                'ASYNC_STORAGE_CONCURRENCY': level
+            })
+            storage = AsyncSharePointClient(flask_app.config, auth_provider=lambda: {'Authorization': 'Bearer bench'})
+            
+            async def run():
+                try:
+                    return await _run_storage_load(create_asgi_app(flask_app, storage), total, payload)
+                finally:
+                    await storage.aclose()
+            
+            result = asyncio.run(run())
+            with flask_app.app_context():
+                db.engine.dispose()
+        
+        click.echo(f"{level:>11} {result['created']:>8} {result['created'] / result['create_seconds']:>9.1f} "
+                   f"{result['uploaded']:>9} {result['uploaded'] / result['upload_seconds']:>10.1f}")
+
+
+# Heavy optional libraries that must only load on first use
+DEFERRED_MODULES = ['openpyxl', 'office365']
+
+# Runs in a fresh interpreter so nothing is already imported
+_STARTUP_PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app(os.getenv('FLASK_ENV', 'default'))
+created = time.perf_counter()
+loaded = sorted(m for m in sys.argv[2:] if m in sys.modules)
+response = flask_app.test_client().get(sys.argv[1])
+served = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (served - created) * 1000,
+    'status': response.status_code,
+    'deferred_loaded': loaded
+}))
+"""
+
+
+def _parse_importtime(stderr: str) -> dict:
+    """Self import time (ms) per top-level package from python -X importtime output"""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        totals[package] = totals.get(package, 0) + int(self_us) / 1000
+    return totals
+
+
+@click.command('profile-startup')
+@click.option('--path', default='/api/stats', help='Request used to time the first request')
+@click.option('--runs', type=int, default=3, help='Fresh interpreter runs (median is reported)')
+@click.option('--top', type=int, default=15, help='Packages shown in the import breakdown')
+@click.option('--max-import-ms', type=float, default=None,
+              help='Fail when importing app takes longer (default STARTUP_MAX_IMPORT_MS, 0 disables)')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+@with_appcontext
+def profile_startup_command(path, runs, top, max_import_ms, as_json):
+    """Measure cold start: import time per package and time to first request"""
+    if max_import_ms is None:
+        max_import_ms = current_app.config.get('STARTUP_MAX_IMPORT_MS', 1500)
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    
+    results = []
+    packages = {}
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _STARTUP_PROBE, path] + DEFERRED_MODULES,
+            cwd=project_root, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            click.echo(proc.stderr[-2000:], err=True)
+            raise SystemExit(proc.returncode)
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        packages = _parse_importtime(proc.stderr)
+    
+    report = {
+        key: statistics.median(r[key] for r in results)
+        for key in ('import_ms', 'create_app_ms', 'first_request_ms')
+    }
+    report['time_to_first_request_ms'] = report['import_ms'] + report['create_app_ms'] + report['first_request_ms']
+    # Any failing run fails the check, not only the last one
+    report['status'] = next((r['status'] for r in results if not 200 <= r['status'] < 400), results[-1]['status'])
+    report['deferred_loaded'] = sorted({m for r in results for m in r['deferred_loaded']})
+    report['packages_ms'] = dict(sorted(packages.items(), key=lambda item: -item[1])[:top])
+    
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+    else:
+        click.echo("Import time by package (self, last run):")
+        for package, ms in report['packages_ms'].items():
+            click.echo(f"  {package:24} {ms:8.1f} ms")
+        click.echo(f"import app:             {report['import_ms']:8.1f} ms")
+        click.echo(f"create_app():           {report['create_app_ms']:8.1f} ms")
+        click.echo(f"first request:          {report['first_request_ms']:8.1f} ms  (GET {path} -> {report['status']})")
+        click.echo(f"time to first request:  {report['time_to_first_request_ms']:8.1f} ms  (median of {runs})")
+        click.echo(f"Deferred modules loaded at startup: {', '.join(report['deferred_loaded']) or 'none'}")
+    
+    failed = False
+    if not 200 <= report['status'] < 400:
+        click.echo(f"FAIL: first request GET {path} returned {report['status']}", err=True)
+        failed = True
+    if report['deferred_loaded']:
+        click.echo(f"FAIL: {', '.join(report['deferred_loaded'])} must be imported on first use", err=True)
+        failed = True
+    if max_import_ms and report['import_ms'] > max_import_ms:
+        click.echo(f"FAIL: import took {report['import_ms']:.1f} ms (limit {max_import_ms:.0f} ms)", err=True)
+        failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+def register_commands(app):
+    """Register maintenance CLI commands (flask <command>)"""
+    app.cli.add_command(tier_cold_documents_command)
+    app.cli.add_command(storage_report_command)
+    app.cli.add_command(scrub_documents_command)
+    app.cli.add_command(purge_deleted_command)
+    app.cli.add_command(bench_payloads_command)
+    app.cli.add_command(bench_storage_concurrency_command)
+    app.cli.add_command(profile_startup_command)
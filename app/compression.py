@@ -0,0 +1,64 @@
+import gzip
+
+from flask import request
+
+# Try to import brotli (optional dependency)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript'
+}
+
+
+def choose_encoding(accept_encodings) -> str:
+    """Pick the best supported content coding the client accepts"""
+    if BROTLI_AVAILABLE and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_body(data: bytes, encoding: str, config) -> bytes:
+    """Compress a response body with the negotiated coding"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESS_BR_LEVEL', 5))
+    return gzip.compress(data, compresslevel=config.get('COMPRESS_GZIP_LEVEL', 6), mtime=0)
+
+
+def init_compression(app):
+    """Negotiated gzip/brotli compression for responses above a size threshold"""
+    
+    @app.after_request
+    def compress_response(response):
+        if not app.config.get('COMPRESS_ENABLED', True):
+            return response
+        
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        
+        encoding = choose_encoding(request.accept_encodings)
+        if not encoding:
+            return response
+        
+        data = response.get_data()
+        if len(data) < app.config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+        
+        response.set_data(compress_body(data, encoding, app.config))
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,139 @@
+import threading
+import time
+
+import sqlalchemy as sa
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = 'replica'
+PRIMARY_PIN_COOKIE = 'cdc_primary_until'
+
+# Replication lag in seconds, per dialect (None: no lag information)
+DEFAULT_LAG_QUERIES = {
+    'postgresql': "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)",
+    'mysql': None,
+    'sqlite': None
+}
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs of read-only requests to the replica bind
+    Flushes, DML and anything outside a replica-routed request use the primary
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and isinstance(clause, sa.Select) and _wants_replica():
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@sa.event.listens_for(RoutingSession, 'after_flush')
+def _record_write(session, flush_context):
+    # Reads after a write in the same request must see it
+    if has_app_context():
+        g.db_wrote = True
+
+
+def _wants_replica() -> bool:
+    return has_app_context() and g.get('db_use_replica', False) and not g.get('db_wrote', False)
+
+
+def use_primary(view):
+    """Mark a GET view that must always read from the primary"""
+    view._use_primary = True
+    return view
+
+
+class ReplicaMonitor:
+    """
+    Cached replica health check
+    The replica is considered usable while it answers and its lag stays
+    below REPLICA_MAX_LAG_SECONDS; otherwise reads fall back to the primary.
+    """
+
+    def __init__(self, engine, config):
+        self.engine = engine
+        self.max_lag = config.get('REPLICA_MAX_LAG_SECONDS', 5)
+        self.check_interval = config.get('REPLICA_LAG_CHECK_INTERVAL', 5)
+        self.lag_query = config.get('REPLICA_LAG_QUERY') or DEFAULT_LAG_QUERIES.get(engine.dialect.name)
+        self.lag = None
+        self.healthy = True
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_healthy(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self.healthy
+
+        with self._lock:
+            if now - self._checked_at >= self.check_interval:
+                self._checked_at = now
+                self.healthy = self._check()
+        return self.healthy
+
+    def _check(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                if self.lag_query:
+                    self.lag = float(conn.execute(sa.text(self.lag_query)).scalar() or 0)
+                else:
+                    conn.execute(sa.text('SELECT 1'))
+                    self.lag = 0.0
+        except Exception as e:
+            print(f"Replica check failed: {e}, reading from primary", flush=True)
+            self.lag = None
+            return False
+
+        if self.lag > self.max_lag:
+            print(f"Replica lag {self.lag:.1f}s exceeds {self.max_lag}s, reading from primary", flush=True)
+            return False
+        return True
+
+
+def init_replica_routing(app, db):
+    """Route read-only requests to the replica bind when one is configured"""
+    if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+
+    pin_seconds = app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10)
+
+    @app.before_request
+    def choose_database():
+        g.db_use_replica = False
+
+        if request.method not in ('GET', 'HEAD'):
+            return
+
+        view = app.view_functions.get(request.endpoint)
+        if getattr(view, '_use_primary', False):
+            return
+
+        # Read-your-writes: clients that just wrote stay on the primary
+        pinned_until = request.cookies.get(PRIMARY_PIN_COOKIE, type=float)
+        if pinned_until and pinned_until > time.time():
+            return
+
+        monitor = app.extensions.get('replica_monitor')
+        if monitor is None:
+            monitor = ReplicaMonitor(db.engines[REPLICA_BIND], app.config)
+            app.extensions['replica_monitor'] = monitor
+
+        g.db_use_replica = monitor.is_healthy()
+
+    @app.after_request
+    def pin_after_write(response):
+        if g.get('db_wrote'):
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                str(time.time() + pin_seconds),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite='Lax'
+            )
+        if request.method in ('GET', 'HEAD'):
+            response.headers['X-DB-Route'] = 'replica' if _wants_replica() else 'primary'
+        return response
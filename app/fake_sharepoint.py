@@ -0,0 +1,31 @@
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def create_fake_sharepoint_app(latency: float = 0.2):
+    """
+    Minimal stand-in for the SharePoint REST endpoints used by
+    AsyncSharePointClient, with a fixed per-call latency (load testing only)
+    """
+
+    async def contextinfo(request):
+        return JSONResponse({'FormDigestValue': 'fake-digest', 'FormDigestTimeoutSeconds': 1800})
+
+    async def api(request):
+        path = request.url.path
+        if request.method != 'POST' or not ('/folders/add(' in path or '/Files/add(' in path):
+            return JSONResponse({'error': 'Not supported by fake SharePoint'}, status_code=404)
+
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        await asyncio.sleep(latency)
+        return JSONResponse({'ServerRelativeUrl': path, 'Length': size})
+
+    return Starlette(routes=[
+        Route('/_api/contextinfo', contextinfo, methods=['POST']),
+        Route('/_api/{rest:path}', api, methods=['GET', 'POST'])
+    ])
@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple
+
+from app.models import db, Case, Document
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class HashingReader:
+    """
+    File-like wrapper that computes SHA-256 of everything read through it
+    Used to hash uploads while they are streamed to storage
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._digest.update(data)
+        return data
+
+    def seek(self, offset: int, whence: int = 0):
+        # Re-reading from the start (e.g. SharePoint fallback) restarts the hash
+        if offset == 0 and whence == 0:
+            self._digest = hashlib.sha256()
+        return self._stream.seek(offset, whence)
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class AsyncHashingReader:
+    """
+    Async view of a HashingReader; blocking reads run in a worker thread
+    .file is the underlying sync reader (same digest) for thread-side copies
+    """
+
+    def __init__(self, stream):
+        self.file = HashingReader(stream)
+
+    async def read(self, size: int = -1) -> bytes:
+        return await asyncio.to_thread(self.file.read, size)
+
+    async def seek(self, offset: int):
+        return await asyncio.to_thread(self.file.seek, offset)
+
+    def hexdigest(self) -> str:
+        return self.file.hexdigest()
+
+
+class RateLimiter:
+    """
+    Token bucket limiting bytes per second, shared between threads
+    """
+
+    def __init__(self, bytes_per_second: Optional[int]):
+        self.rate = bytes_per_second
+        self._tokens = float(bytes_per_second or 0)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int):
+        """Reserve amount bytes, sleeping long enough to keep the average rate"""
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def sha256_chunks(chunks: Iterable[bytes], limiter: Optional[RateLimiter] = None) -> Tuple[str, int]:
+    """
+    Hash a stream of chunks
+    Returns: (hex digest, total bytes)
+    """
+    digest = hashlib.sha256()
+    total = 0
+    for chunk in chunks:
+        if limiter:
+            limiter.consume(len(chunk))
+        digest.update(chunk)
+        total += len(chunk)
+    return digest.hexdigest(), total
+
+
+def find_duplicates(case_id: Optional[int] = None):
+    """
+    Documents whose content appears in more than one case
+    A single query: the grouped hash subquery is joined back on the
+    indexed sha256 column. Optionally limited to hashes present in one case.
+    Deleted documents and documents of deleted cases are ignored.
+    """
+    live = db.and_(Document.deleted_at.is_(None), Case.deleted_at.is_(None))
+
+    dup_hashes = db.session.query(Document.sha256).join(Case).filter(
+        Document.sha256.isnot(None),
+        live
+    ).group_by(Document.sha256).having(
+        db.func.count(db.distinct(Document.case_id)) > 1
+    )
+    if case_id is not None:
+        dup_hashes = dup_hashes.filter(
+            Document.sha256.in_(
+                db.session.query(Document.sha256).filter(
+                    Document.case_id == case_id,
+                    Document.deleted_at.is_(None)
+                )
+            )
+        )
+    dup_hashes = dup_hashes.subquery()
+
+    return Document.query.join(Case).join(
+        dup_hashes, Document.sha256 == dup_hashes.c.sha256
+    ).filter(live).order_by(Document.sha256, Document.case_id, Document.id).all()
+
+
+def _verify_one(sp_service, item: dict, limiter: RateLimiter) -> dict:
+    """Re-hash one stored file (runs in the scrubber thread pool)"""
+    result = {'id': item['id'], 'expected': item['sha256']}
+    try:
+        chunks = sp_service.iter_file(item['path'], item['from_sharepoint'], READ_CHUNK_SIZE, item['codec'])
+        result['actual'], result['size'] = sha256_chunks(chunks, limiter)
+    except (IOError, OSError) as e:
+        result['error'] = str(e)
+    return result
+
+
+def scrub_documents(sp_service, workers: int = 2, bytes_per_second: Optional[int] = None,
+                    backfill: bool = False, batch_size: int = 100) -> Iterator[dict]:
+    """
+    Re-verify stored files against their SHA-256
+    Reads run in a bounded thread pool and share one rate limiter so the
+    scrubber cannot starve production I/O. Documents without a hash are
+    skipped unless backfill is set, in which case their hash is stored.
+    Yields one result dict per document.
+    """
+    limiter = RateLimiter(bytes_per_second)
+    last_id = 0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrubber') as executor:
+        while True:
+            query = Document.query.filter(Document.id > last_id)
+            if not backfill:
+                query = query.filter(Document.sha256.isnot(None))
+            batch = query.order_by(Document.id).limit(batch_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            # Detach plain values so worker threads never touch the session
+            items = [{
+                'id': d.id,
+                'sha256': d.sha256,
+                'path': d.sharepoint_path or d.local_path,
+                'from_sharepoint': bool(d.sharepoint_path),
+                'codec': None if d.sharepoint_path else d.storage_codec
+            } for d in batch if d.sharepoint_path or d.local_path]
+
+            for result in executor.map(lambda item: _verify_one(sp_service, item, limiter), items):
+                if 'error' in result:
+                    result['status'] = 'missing'
+                elif result['expected'] is None:
+                    db.session.get(Document, result['id']).sha256 = result['actual']
+                    result['status'] = 'backfilled'
+                elif result['actual'] == result['expected']:
+                    result['status'] = 'ok'
+                else:
+                    result['status'] = 'mismatch'
+                yield result
+
+            if backfill:
+                db.session.commit()
+            # Release the batch from the identity map
+            db.session.expunge_all()
@@ -0,0 +1,41 @@
+from flask.json.provider import DefaultJSONProvider
+
+# Try to import orjson (optional dependency)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson
+    Falls back to the standard library provider when orjson is not installed
+    or when custom dump arguments are passed
+    """
+    
+    def _options(self, pretty: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs) -> str:
+        if not ORJSON_AVAILABLE or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        if not ORJSON_AVAILABLE:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._options(pretty)) + b'\n',
+            mimetype=self.mimetype
+        )
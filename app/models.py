@@ -1,7 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from app.db_routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 class Case(db.Model):
@@ -16,9 +17,16 @@ class Case(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     notes = db.Column(db.Text, nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)  # Soft delete, purged after retention
     
     # Relationships
-    documents = db.relationship('Document', backref='case', lazy=True, cascade='all, delete-orphan')
+    # Soft-deleted documents are hidden; rows are removed in bulk by the retention purge
+    documents = db.relationship(
+        'Document',
+        primaryjoin='and_(Case.id == Document.case_id, Document.deleted_at.is_(None))',
+        lazy=True,
+        viewonly=True
+    )
     status_history = db.relationship('StatusHistory', backref='case', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self):
@@ -48,10 +56,17 @@ class Document(db.Model):
     original_filename = db.Column(db.String(255), nullable=False)
     file_size = db.Column(db.Integer, nullable=True)
     mime_type = db.Column(db.String(100), nullable=True)
+    sha256 = db.Column(db.String(64), nullable=True, index=True)
     sharepoint_path = db.Column(db.String(500), nullable=True)
     local_path = db.Column(db.String(500), nullable=True)
+    storage_codec = db.Column(db.String(10), nullable=True)  # None (raw) or 'zstd' (cold tier)
+    stored_size = db.Column(db.Integer, nullable=True)  # Bytes on disk when compressed
+    tier_checked_at = db.Column(db.DateTime, nullable=True)  # Cold tier tried, kept raw (low ratio)
     uploaded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     notes = db.Column(db.Text, nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)  # Soft delete, purged after retention
+    
+    case = db.relationship('Case', lazy=True)
     
     def to_dict(self):
         """Convert document to dictionary"""
@@ -63,6 +78,7 @@ class Document(db.Model):
             'original_filename': self.original_filename,
             'file_size': self.file_size,
             'mime_type': self.mime_type,
+            'sha256': self.sha256,
             'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
             'notes': self.notes
         }
@@ -91,3 +107,41 @@ class StatusHistory(db.Model):
             'changed_by': self.changed_by,
             'notes': self.notes
         }
+
+
+class UploadSession(db.Model):
+    """Resumable upload session - 分段上傳工作階段"""
+    __tablename__ = 'upload_sessions'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id'), nullable=False, index=True)
+    doc_type = db.Column(db.String(20), nullable=False)
+    original_filename = db.Column(db.String(255), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    mime_type = db.Column(db.String(100), nullable=True)
+    total_size = db.Column(db.Integer, nullable=False)
+    received_size = db.Column(db.Integer, nullable=False, default=0)
+    checksum = db.Column(db.String(64), nullable=True)  # Client supplied SHA-256 (hex)
+    status = db.Column(db.String(20), nullable=False, default='Uploading')  # Uploading/Assembling/Completed/Failed
+    error = db.Column(db.Text, nullable=True)
+    document_id = db.Column(db.Integer, db.ForeignKey('documents.id'), nullable=True)
+    notes = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert upload session to dictionary"""
+        return {
+            'id': self.id,
+            'case_id': self.case_id,
+            'doc_type': self.doc_type,
+            'original_filename': self.original_filename,
+            'filename': self.filename,
+            'total_size': self.total_size,
+            'offset': self.received_size,
+            'status': self.status,
+            'error': self.error,
+            'document_id': self.document_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
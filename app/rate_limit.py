@@ -0,0 +1,157 @@
+import math
+import threading
+import time
+from typing import Optional, Tuple
+
+from flask import g, jsonify, request
+from werkzeug.wsgi import ClosingIterator
+
+# Drop idle buckets once this many clients are tracked
+MAX_TRACKED_BUCKETS = 10000
+
+
+def rate_limited(limit_class: str):
+    """Assign a view to a rate limit / concurrency class (see RATE_LIMITS)"""
+    def decorator(view):
+        view._rate_limit_class = limit_class
+        return view
+    return decorator
+
+
+class AdmissionController:
+    """
+    In-process admission control
+    Each (class, client) pair has a token bucket (rate per second, burst) and
+    a concurrency cap; each class also has a global concurrency cap. State is
+    per process, so with N workers the effective limits are N times higher.
+    """
+
+    def __init__(self, limits: dict):
+        self.limits = limits
+        self._buckets = {}
+        self._active_clients = {}
+        self._active_classes = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, client_id: str, limit_class: str) -> Tuple[Optional[int], int]:
+        """
+        Admit a request or tell how to shed it
+        Returns: (None, 0) when admitted (call release() afterwards),
+                 otherwise (status_code, retry_after_seconds)
+        """
+        limit = self.limits.get(limit_class)
+        if not limit:
+            return None, 0
+
+        key = (limit_class, client_id)
+        rate = limit.get('rate')
+        burst = limit.get('burst', 1)
+        now = time.monotonic()
+
+        with self._lock:
+            if rate:
+                tokens, updated = self._buckets.get(key, (burst, now))
+                tokens = min(burst, tokens + (now - updated) * rate)
+                if tokens < 1:
+                    self._buckets[key] = (tokens, now)
+                    return 429, math.ceil((1 - tokens) / rate)
+
+            if self._active_clients.get(key, 0) >= limit.get('per_client_concurrency', math.inf):
+                return 429, 1
+            if self._active_classes.get(limit_class, 0) >= limit.get('concurrency', math.inf):
+                return 503, 1
+
+            if rate:
+                self._buckets[key] = (tokens - 1, now)
+                if len(self._buckets) > MAX_TRACKED_BUCKETS:
+                    self._prune(now)
+            self._active_clients[key] = self._active_clients.get(key, 0) + 1
+            self._active_classes[limit_class] = self._active_classes.get(limit_class, 0) + 1
+
+        return None, 0
+
+    def release(self, client_id: str, limit_class: str):
+        """Free the concurrency slot taken by try_acquire"""
+        key = (limit_class, client_id)
+        with self._lock:
+            if self._active_clients.get(key, 0) <= 1:
+                self._active_clients.pop(key, None)
+            else:
+                self._active_clients[key] -= 1
+            self._active_classes[limit_class] = max(self._active_classes.get(limit_class, 0) - 1, 0)
+
+    def _prune(self, now: float):
+        # A bucket that has refilled completely is equivalent to a new one
+        for key, (tokens, updated) in list(self._buckets.items()):
+            limit = self.limits[key[0]]
+            if tokens + (now - updated) * limit['rate'] >= limit.get('burst', 1):
+                del self._buckets[key]
+
+
+def shed_message(status_code: int) -> str:
+    if status_code == 429:
+        return 'Too many requests. Please retry later.'
+    return 'Server is busy. Please retry later.'
+
+
+def client_id_from(remote_addr: Optional[str], forwarded_for: Optional[str], trust_proxy: bool) -> str:
+    """
+    Identify the client by IP
+    Behind a trusted proxy the last X-Forwarded-For entry is used: it is the
+    one the proxy appended, earlier entries come from the client and can be forged
+    """
+    if trust_proxy and forwarded_for:
+        return forwarded_for.split(',')[-1].strip() or remote_addr or 'unknown'
+    return remote_addr or 'unknown'
+
+
+def init_rate_limiting(app):
+    """Shed overloaded requests with 429/503 before the view runs"""
+    if not app.config.get('RATE_LIMIT_ENABLED', True):
+        return
+
+    controller = AdmissionController(app.config.get('RATE_LIMITS', {}))
+    app.extensions['admission_controller'] = controller
+    trust_proxy = app.config.get('RATE_LIMIT_TRUST_PROXY', False)
+
+    @app.before_request
+    def admit_request():
+        view = app.view_functions.get(request.endpoint)
+        limit_class = getattr(view, '_rate_limit_class', None)
+        if limit_class is None:
+            return None
+
+        client_id = client_id_from(request.remote_addr, request.headers.get('X-Forwarded-For'), trust_proxy)
+        status_code, retry_after = controller.try_acquire(client_id, limit_class)
+        if status_code:
+            response = jsonify({
+                'success': False,
+                'error': shed_message(status_code)
+            })
+            response.status_code = status_code
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+
+        g.rate_limit_slot = (client_id, limit_class)
+        return None
+
+    @app.after_request
+    def hold_slot_until_sent(response):
+        # Streamed responses (archives, downloads) keep the slot until closed
+        slot = g.pop('rate_limit_slot', None)
+        if slot:
+            if response.direct_passthrough:
+                # send_file: Werkzeug hands this iterable to the server as is,
+                # so call_on_close would never run
+                response.response = ClosingIterator(response.response, lambda: controller.release(*slot))
+            elif response.is_streamed:
+                response.call_on_close(lambda: controller.release(*slot))
+            else:
+                controller.release(*slot)
+        return response
+
+    @app.teardown_request
+    def release_on_error(exc):
+        slot = g.pop('rate_limit_slot', None)
+        if slot:
+            controller.release(*slot)
@@ -0,0 +1,153 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.models import db, Case, Document, StatusHistory, UploadSession
+from app.sharepoint_service import SharePointService
+from app.upload_service import ChunkedUploadService
+
+
+def purgeable_documents(cutoff: datetime):
+    """Filter: documents deleted before cutoff, or belonging to a case deleted before cutoff"""
+    deleted_cases = db.session.query(Case.id).filter(Case.deleted_at < cutoff)
+    return db.or_(Document.deleted_at < cutoff, Document.case_id.in_(deleted_cases))
+
+
+def _shared_paths(ids: list, paths: set) -> set:
+    """Paths of the batch that are still referenced by other documents (same filename re-uploaded)"""
+    if not paths:
+        return set()
+    rows = db.session.query(Document.local_path, Document.sharepoint_path).filter(
+        db.or_(Document.local_path.in_(paths), Document.sharepoint_path.in_(paths)),
+        Document.id.notin_(ids)
+    ).all()
+    return {path for row in rows for path in row if path}
+
+
+def _purge_document_batch(rows, sp_service, executor, report: dict) -> list:
+    """
+    Delete the stored files of a batch in parallel (outside any transaction)
+    Returns: ids whose file is gone and whose row can be deleted
+    """
+    ids = [row.id for row in rows]
+    shared = _shared_paths(ids, {row.sharepoint_path or row.local_path for row in rows
+                                 if row.sharepoint_path or row.local_path})
+    # End the read transaction before the slow storage calls
+    db.session.rollback()
+
+    def delete(row):
+        path = row.sharepoint_path or row.local_path
+        if not path or path in shared:
+            return True, None
+        return sp_service.delete_file(path, bool(row.sharepoint_path))
+
+    purged = []
+    for row, (success, error) in zip(rows, executor.map(delete, rows)):
+        if success:
+            purged.append(row.id)
+            report['bytes_reclaimed'] += row.stored_size or row.file_size or 0
+        else:
+            print(f"Purge error for document {row.id}: {error}", flush=True)
+            report['file_errors'] += 1
+    return purged
+
+
+def purge_deleted(config, older_than_days: int = None, batch_size: int = None,
+                  workers: int = None, dry_run: bool = False) -> dict:
+    """
+    Permanently remove soft-deleted documents and cases past the retention period
+    Rows are deleted with batched DELETE ... WHERE id IN (...) statements, each
+    batch in its own short transaction, and storage files are removed in a
+    thread pool between transactions so SQLite writers are never blocked for
+    long. Rows whose file could not be removed are kept and retried next run.
+    """
+    if older_than_days is None:
+        older_than_days = config.get('DELETED_RETENTION_DAYS', 30)
+    batch_size = batch_size or config.get('PURGE_BATCH_SIZE', 200)
+    workers = workers or config.get('PURGE_WORKERS', 4)
+    pause = config.get('PURGE_BATCH_PAUSE', 0.05)
+
+    report = {
+        'documents': 0,
+        'cases': 0,
+        'file_errors': 0,
+        'bytes_reclaimed': 0,
+        'dry_run': dry_run
+    }
+
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    cold_path = Path(config.get('COLD_STORAGE_PATH', './instance/cold'))
+    sp_service = SharePointService(config)
+    upload_service = ChunkedUploadService(config)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='purge') as executor:
+        last_id = 0
+        while True:
+            rows = db.session.query(
+                Document.id,
+                Document.local_path,
+                Document.sharepoint_path,
+                Document.file_size,
+                Document.stored_size
+            ).filter(
+                purgeable_documents(cutoff),
+                Document.id > last_id
+            ).order_by(Document.id).limit(batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            if dry_run:
+                report['documents'] += len(rows)
+                report['bytes_reclaimed'] += sum(row.stored_size or row.file_size or 0 for row in rows)
+                continue
+
+            ids = _purge_document_batch(rows, sp_service, executor, report)
+            if ids:
+                UploadSession.query.filter(UploadSession.document_id.in_(ids)).delete(synchronize_session=False)
+                Document.query.filter(Document.id.in_(ids)).delete(synchronize_session=False)
+                db.session.commit()
+                report['documents'] += len(ids)
+            time.sleep(pause)
+
+        # Cases go once all their documents are purged (failed files keep the case)
+        last_id = 0
+        while True:
+            query = db.session.query(Case.id, Case.case_number, Case.sharepoint_folder_path).filter(
+                Case.deleted_at < cutoff,
+                Case.id > last_id
+            )
+            if not dry_run:
+                query = query.filter(~db.exists().where(Document.case_id == Case.id))
+            rows = query.order_by(Case.id).limit(batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            ids = [row.id for row in rows]
+            if dry_run:
+                report['cases'] += len(ids)
+                continue
+
+            upload_ids = [upload_id for (upload_id,) in
+                          db.session.query(UploadSession.id).filter(UploadSession.case_id.in_(ids))]
+            db.session.rollback()
+
+            for upload_id in upload_ids:
+                upload_service.staging_file(upload_id).unlink(missing_ok=True)
+            folders = [row.sharepoint_folder_path for row in rows if row.sharepoint_folder_path]
+            # Cold tier folder (storage_tiering) of the case, removed when empty
+            folders += [str(cold_path / row.case_number) for row in rows]
+            for folder, (success, error) in zip(folders, executor.map(sp_service.delete_case_folder, folders)):
+                if not success:
+                    print(f"Purge error for case folder {folder}: {error}", flush=True)
+
+            UploadSession.query.filter(UploadSession.case_id.in_(ids)).delete(synchronize_session=False)
+            StatusHistory.query.filter(StatusHistory.case_id.in_(ids)).delete(synchronize_session=False)
+            Case.query.filter(Case.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            report['cases'] += len(ids)
+            time.sleep(pause)
+
+    return report
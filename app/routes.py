@@ -1,9 +1,16 @@
-from flask import Blueprint, request, jsonify, send_file
-from app.models import db, Case, Document, StatusHistory
+from flask import Blueprint, request, jsonify, send_file, current_app, Response
+from sqlalchemy.orm import selectinload
+from app.models import db, Case, Document, StatusHistory, UploadSession
 from app.sharepoint_service import SharePointService
-from app.excel_template import create_procurement_template, create_blank_template
-from datetime import datetime
+from app.upload_service import ChunkedUploadService
+from app.archive_service import stream_case_archive, archive_filename
+from app.storage_tiering import storage_report
+from app.integrity import HashingReader, find_duplicates
+from app.db_routing import use_primary
+from app.rate_limit import rate_limited
+from datetime import datetime, timedelta, timezone
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -14,10 +21,29 @@ VALID_STATUSES = ['Draft', 'Submitted', 'Approved', 'Closed', 'Rejected']
 
 def get_sharepoint_service():
     """Get SharePoint service instance"""
-    from flask import current_app
     return SharePointService(current_app.config)
 
 
+def get_upload_service():
+    """Get chunked upload service instance"""
+    return ChunkedUploadService(current_app.config)
+
+
+def to_columnar(records, timestamp_fields=()):
+    """
+    Compact list format: column names once, then one value array per row
+    Timestamp fields are sent as UTC epoch seconds instead of ISO strings
+    """
+    columns = list(records[0].keys()) if records else []
+    rows = []
+    for record in records:
+        for field in timestamp_fields:
+            if record.get(field):
+                record[field] = int(datetime.fromisoformat(record[field]).replace(tzinfo=timezone.utc).timestamp())
+        rows.append([record[column] for column in columns])
+    return {'columns': columns, 'rows': rows}
+
+
 def generate_case_number(prefix='CDC-PR'):
     """
     Generate unique case number
@@ -40,11 +66,92 @@ def generate_case_number(prefix='CDC-PR'):
     return case_number
 
 
+def get_case_or_404(case_id):
+    """Fetch a case that has not been deleted"""
+    return Case.query.filter_by(id=case_id, deleted_at=None).first_or_404()
+
+
+def check_document_type(case_id, doc_type):
+    """
+    Validate doc_type and the one-main-document-per-case rule
+    Returns: error_message or None
+    """
+    if doc_type not in ['main', 'attachment']:
+        return 'Invalid doc_type. Must be "main" or "attachment"'
+    
+    if doc_type == 'main':
+        existing_main = Document.query.filter_by(
+            case_id=case_id, 
+            doc_type='main',
+            deleted_at=None
+        ).first()
+        if existing_main:
+            return 'Main document already exists. Please delete it first or upload as attachment.'
+    
+    return None
+
+
+def add_case(case_number, title, notes, folder_path):
+    """Insert a new Draft case with its initial status history (not committed)"""
+    case = Case(
+        case_number=case_number,
+        title=title,
+        current_status='Draft',
+        sharepoint_folder_path=folder_path,
+        notes=notes
+    )
+    db.session.add(case)
+    
+    # Add initial status history
+    status_history = StatusHistory(
+        case=case,
+        old_status=None,
+        new_status='Draft',
+        notes='Case created'
+    )
+    db.session.add(status_history)
+    return case
+
+
+def add_document(case, doc_type, safe_filename, original_filename, file_size,
+                 mime_type, sha256, file_path, in_sharepoint, notes):
+    """Insert a Document row for a stored file and touch the case (not committed)"""
+    document = Document(
+        case_id=case.id,
+        doc_type=doc_type,
+        filename=safe_filename,
+        original_filename=original_filename,
+        file_size=file_size,
+        mime_type=mime_type,
+        sha256=sha256,
+        sharepoint_path=file_path if in_sharepoint else None,
+        local_path=file_path if not in_sharepoint else None,
+        notes=notes
+    )
+    db.session.add(document)
+    
+    # Update case timestamp
+    case.updated_at = datetime.utcnow()
+    return document
+
+
+def find_cross_case_duplicates(document):
+    """Documents with the same content in other cases (indexed lookup)"""
+    return Document.query.join(Case).filter(
+        Document.sha256 == document.sha256,
+        Document.case_id != document.case_id,
+        Document.deleted_at.is_(None),
+        Case.deleted_at.is_(None)
+    ).all()
+
+
 @api_bp.route('/cases', methods=['GET'])
+@rate_limited('search')
 def list_cases():
     """
     List all cases with optional filtering
     GET /api/cases?status=Draft&page=1&per_page=20
+    GET /api/cases?format=columnar (compact {columns, rows} list, epoch timestamps)
     """
     try:
         # Get query parameters
@@ -54,7 +161,7 @@ def list_cases():
         search = request.args.get('search', '').strip()
         
         # Build query
-        query = Case.query
+        query = Case.query.filter(Case.deleted_at.is_(None))
         
         if status:
             query = query.filter_by(current_status=status)
@@ -73,9 +180,13 @@ def list_cases():
         # Paginate
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
         
+        cases = [case.to_dict() for case in pagination.items]
+        if request.args.get('format') == 'columnar':
+            cases = to_columnar(cases, timestamp_fields=('created_at', 'updated_at'))
+        
         return jsonify({
             'success': True,
-            'cases': [case.to_dict() for case in pagination.items],
+            'cases': cases,
             'total': pagination.total,
             'page': page,
             'per_page': per_page,
@@ -95,7 +206,7 @@ def get_case(case_id):
     GET /api/cases/{id}
     """
     try:
-        case = Case.query.get_or_404(case_id)
+        case = get_case_or_404(case_id)
         
         # Get case details with documents and history
         case_dict = case.to_dict()
@@ -142,24 +253,7 @@ def create_case():
             }), 500
         
         # Create case in database
-        case = Case(
-            case_number=case_number,
-            title=title,
-            current_status='Draft',
-            sharepoint_folder_path=folder_path,
-            notes=notes
-        )
-        db.session.add(case)
-        
-        # Add initial status history
-        status_history = StatusHistory(
-            case=case,
-            old_status=None,
-            new_status='Draft',
-            notes='Case created'
-        )
-        db.session.add(status_history)
-        
+        case = add_case(case_number, title, notes, folder_path)
         db.session.commit()
         
         return jsonify({
@@ -176,6 +270,7 @@ def create_case():
 
 
 @api_bp.route('/cases/<int:case_id>/documents', methods=['POST'])
+@rate_limited('uploads')
 def upload_document(case_id):
     """
     Upload document(s) to a case
@@ -183,7 +278,7 @@ def upload_document(case_id):
     Form data: file (required), doc_type (main/attachment), notes (optional)
     """
     try:
-        case = Case.query.get_or_404(case_id)
+        case = get_case_or_404(case_id)
         
         if 'file' not in request.files:
             return jsonify({
@@ -201,25 +296,14 @@ def upload_document(case_id):
         doc_type = request.form.get('doc_type', 'attachment')
         notes = request.form.get('notes', '').strip()
         
-        # Validate doc_type
-        if doc_type not in ['main', 'attachment']:
+        # Validate doc_type and main document uniqueness
+        error = check_document_type(case_id, doc_type)
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'Invalid doc_type. Must be "main" or "attachment"'
+                'error': error
             }), 400
         
-        # Check if main document already exists
-        if doc_type == 'main':
-            existing_main = Document.query.filter_by(
-                case_id=case_id, 
-                doc_type='main'
-            ).first()
-            if existing_main:
-                return jsonify({
-                    'success': False,
-                    'error': 'Main document already exists. Please delete it first or upload as attachment.'
-                }), 400
-        
         # Upload file to SharePoint/local storage
         sp_service = get_sharepoint_service()
         original_filename = file.filename
@@ -237,6 +321,10 @@ def upload_document(case_id):
         file_size = file.tell()
         file.seek(0)  # Reset to beginning
         
+        # Hash while the upload is streamed to storage
+        hashing_stream = HashingReader(file.stream)
+        file.stream = hashing_stream
+        
         success, file_path, error = sp_service.upload_file(
             case.case_number, 
             file, 
@@ -250,27 +338,24 @@ def upload_document(case_id):
             }), 500
         
         # Create document record
-        document = Document(
-            case_id=case_id,
-            doc_type=doc_type,
-            filename=safe_filename,
-            original_filename=original_filename,
-            file_size=file_size,
-            mime_type=file.content_type,
-            sharepoint_path=file_path if sp_service.sharepoint_enabled else None,
-            local_path=file_path if not sp_service.sharepoint_enabled else None,
-            notes=notes
+        document = add_document(
+            case,
+            doc_type,
+            safe_filename,
+            original_filename,
+            file_size,
+            file.content_type,
+            hashing_stream.hexdigest(),
+            file_path,
+            sp_service.sharepoint_enabled,
+            notes
         )
-        db.session.add(document)
-        
-        # Update case timestamp
-        case.updated_at = datetime.utcnow()
-        
         db.session.commit()
         
         return jsonify({
             'success': True,
             'document': document.to_dict(),
+            'duplicates': [d.to_dict() for d in find_cross_case_duplicates(document)],
             'message': 'Document uploaded successfully'
         }), 201
     except Exception as e:
@@ -281,6 +366,235 @@ def upload_document(case_id):
         }), 500
 
 
+@api_bp.route('/cases/<int:case_id>/uploads', methods=['POST'])
+@rate_limited('uploads')
+def create_upload(case_id):
+    """
+    Start a resumable upload
+    POST /api/cases/{id}/uploads
+    Body: {filename: string, total_size: int, doc_type: main/attachment,
+           mime_type: string, checksum: sha256 hex (optional), notes: string}
+    """
+    try:
+        case = get_case_or_404(case_id)
+        data = request.get_json() or {}
+        
+        filename = (data.get('filename') or '').strip()
+        total_size = data.get('total_size')
+        doc_type = data.get('doc_type', 'attachment')
+        notes = (data.get('notes') or '').strip()
+        
+        if not filename:
+            return jsonify({
+                'success': False,
+                'error': 'filename is required'
+            }), 400
+        
+        if not isinstance(total_size, int):
+            return jsonify({
+                'success': False,
+                'error': 'total_size must be an integer'
+            }), 400
+        
+        # Fail fast before any bytes are transferred
+        error = check_document_type(case_id, doc_type)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        upload_service = get_upload_service()
+        upload_service.purge_expired_sessions()
+        
+        upload, error = upload_service.create_session(
+            case,
+            filename,
+            total_size,
+            doc_type,
+            mime_type=data.get('mime_type'),
+            checksum=data.get('checksum'),
+            notes=notes
+        )
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        db.session.add(upload)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'upload': upload.to_dict(),
+            'chunk_max_size': upload_service.chunk_max_size
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/uploads/<upload_id>', methods=['GET'])
+@use_primary
+def get_upload(upload_id):
+    """
+    Get upload progress (current offset) to resume or poll assembly
+    GET /api/uploads/{upload_id}
+    """
+    try:
+        upload = UploadSession.query.get_or_404(upload_id)
+        
+        # The worker that was assembling it is gone; report a final state
+        upload_service = get_upload_service()
+        if upload_service.is_stale(upload):
+            upload_service.fail_stale(upload)
+            db.session.commit()
+        
+        result = {
+            'success': True,
+            'upload': upload.to_dict()
+        }
+        if upload.document_id:
+            result['document'] = db.session.get(Document, upload.document_id).to_dict()
+        
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/uploads/<upload_id>', methods=['PUT'])
+@rate_limited('uploads')
+def upload_chunk(upload_id):
+    """
+    Append a chunk to an upload
+    PUT /api/uploads/{upload_id}?offset=N
+    Body: raw bytes (Upload-Offset header may be used instead of offset)
+    """
+    try:
+        upload = UploadSession.query.get_or_404(upload_id)
+        
+        offset = request.args.get('offset', type=int)
+        if offset is None:
+            offset = request.headers.get('Upload-Offset', type=int)
+        if offset is None:
+            return jsonify({
+                'success': False,
+                'error': 'offset is required'
+            }), 400
+        
+        upload_service = get_upload_service()
+        success, error = upload_service.append_chunk(upload, offset, request.stream)
+        
+        if not success:
+            # Client should resume from the returned offset
+            return jsonify({
+                'success': False,
+                'error': error,
+                'upload': upload.to_dict()
+            }), 409
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'upload': upload.to_dict()
+        })
+    except RequestEntityTooLarge as e:
+        # Resending the same chunk cannot succeed, so not a 409
+        return jsonify({
+            'success': False,
+            'error': e.description,
+            'upload': upload.to_dict()
+        }), 413
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/uploads/<upload_id>/complete', methods=['POST'])
+@rate_limited('uploads')
+def complete_upload(upload_id):
+    """
+    Finalize an upload; assembly and verification run in the background
+    POST /api/uploads/{upload_id}/complete
+    """
+    try:
+        upload = UploadSession.query.get_or_404(upload_id)
+        
+        if upload.status != 'Uploading':
+            return jsonify({
+                'success': False,
+                'error': f'Upload is {upload.status}',
+                'upload': upload.to_dict()
+            }), 409
+        
+        if upload.received_size != upload.total_size:
+            return jsonify({
+                'success': False,
+                'error': f'Upload incomplete: {upload.received_size} of {upload.total_size} bytes received',
+                'upload': upload.to_dict()
+            }), 409
+        
+        upload.status = 'Assembling'
+        db.session.commit()
+        
+        get_upload_service().start_assembly(current_app._get_current_object(), upload.id)
+        
+        return jsonify({
+            'success': True,
+            'upload': upload.to_dict(),
+            'message': 'Upload received, assembling document'
+        }), 202
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/uploads/<upload_id>', methods=['DELETE'])
+def abort_upload(upload_id):
+    """
+    Abort an upload and discard received chunks
+    DELETE /api/uploads/{upload_id}
+    """
+    try:
+        upload = UploadSession.query.get_or_404(upload_id)
+        
+        upload_service = get_upload_service()
+        if upload.status == 'Completed' or (upload.status == 'Assembling' and not upload_service.is_stale(upload)):
+            return jsonify({
+                'success': False,
+                'error': f'Upload is {upload.status}'
+            }), 409
+        
+        upload_service.abort(upload)
+        db.session.delete(upload)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Upload aborted'
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @api_bp.route('/cases/<int:case_id>/status', methods=['PUT'])
 def update_case_status(case_id):
     """
@@ -289,7 +603,7 @@ def update_case_status(case_id):
     Body: {status: string, notes: string}
     """
     try:
-        case = Case.query.get_or_404(case_id)
+        case = get_case_or_404(case_id)
         data = request.get_json()
         
         new_status = data.get('status', '').strip()
@@ -342,16 +656,43 @@ def update_case_status(case_id):
         }), 500
 
 
+@api_bp.route('/cases/<int:case_id>', methods=['DELETE'])
+def delete_case(case_id):
+    """
+    Soft delete a case and hide its documents
+    Purged permanently after DELETED_RETENTION_DAYS (flask purge-deleted)
+    DELETE /api/cases/{id}
+    """
+    try:
+        case = get_case_or_404(case_id)
+        
+        case.deleted_at = datetime.utcnow()
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Case {case.case_number} deleted'
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @api_bp.route('/cases/<int:case_id>/template', methods=['GET'])
+@rate_limited('templates')
 def download_case_template(case_id):
     """
     Download Excel template for a case
     GET /api/cases/{id}/template
     """
     try:
-        case = Case.query.get_or_404(case_id)
+        case = get_case_or_404(case_id)
         
-        # Generate Excel template
+        # Generate Excel template (openpyxl is loaded on first use)
+        from app.excel_template import create_procurement_template
         template = create_procurement_template(case.case_number, case.title or '')
         
         filename = f"{case.case_number}_procurement_request.xlsx"
@@ -369,7 +710,206 @@ def download_case_template(case_id):
         }), 500
 
 
+@api_bp.route('/documents/duplicates', methods=['GET'])
+@rate_limited('search')
+def list_duplicate_documents():
+    """
+    List documents whose content (SHA-256) appears in more than one case
+    GET /api/documents/duplicates?case_id=1
+    """
+    try:
+        case_id = request.args.get('case_id', type=int)
+        
+        groups = {}
+        for document in find_duplicates(case_id):
+            groups.setdefault(document.sha256, []).append(document.to_dict())
+        
+        return jsonify({
+            'success': True,
+            'duplicates': [
+                {'sha256': sha256, 'documents': documents}
+                for sha256, documents in groups.items()
+            ],
+            'total': len(groups)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/documents/<int:document_id>/download', methods=['GET'])
+def download_document(document_id):
+    """
+    Download a document (cold tier files are decompressed on the fly)
+    GET /api/documents/{id}/download
+    """
+    try:
+        document = Document.query.join(Case).filter(
+            Document.id == document_id,
+            Document.deleted_at.is_(None),
+            Case.deleted_at.is_(None)
+        ).first_or_404()
+        
+        chunks = get_sharepoint_service().iter_document(document)
+        # Surface missing files as an error before the response starts
+        first = next(chunks, b'')
+        
+        def generate():
+            yield first
+            yield from chunks
+        
+        headers = {'Content-Disposition': f'attachment; filename="{document.filename}"'}
+        if document.file_size is not None:
+            headers['Content-Length'] = str(document.file_size)
+        
+        return Response(
+            generate(),
+            mimetype=document.mime_type or 'application/octet-stream',
+            headers=headers
+        )
+    except (IOError, OSError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'File not available: {document.filename}'
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/documents/<int:document_id>', methods=['DELETE'])
+def delete_document(document_id):
+    """
+    Soft delete a document (e.g. to replace the main document)
+    Purged permanently after DELETED_RETENTION_DAYS (flask purge-deleted)
+    DELETE /api/documents/{id}
+    """
+    try:
+        document = Document.query.join(Case).filter(
+            Document.id == document_id,
+            Document.deleted_at.is_(None),
+            Case.deleted_at.is_(None)
+        ).first_or_404()
+        
+        document.deleted_at = datetime.utcnow()
+        document.case.updated_at = datetime.utcnow()
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Document deleted'
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def archive_response(cases, prefix_case_folder):
+    """Stream a ZIP archive of the given cases"""
+    filename = archive_filename([case.case_number for case in cases])
+    return Response(
+        stream_case_archive(cases, get_sharepoint_service(), prefix_case_folder),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@api_bp.route('/cases/<int:case_id>/archive', methods=['GET'])
+@rate_limited('archives')
+def download_case_archive(case_id):
+    """
+    Download all documents of a case as a streamed ZIP archive
+    Includes the Excel template and a manifest.json of the status history
+    GET /api/cases/{id}/archive
+    """
+    try:
+        case = Case.query.options(
+            selectinload(Case.documents),
+            selectinload(Case.status_history)
+        ).filter_by(id=case_id, deleted_at=None).first_or_404()
+        
+        return archive_response([case], prefix_case_folder=False)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/cases/archive', methods=['GET'])
+@rate_limited('archives')
+def download_cases_archive():
+    """
+    Download several cases as one streamed ZIP archive (one folder per case)
+    GET /api/cases/archive?ids=1,2,3
+    GET /api/cases/archive?from=2025-01-01&to=2025-12-31&status=Closed
+    """
+    try:
+        ids = request.args.get('ids', '').strip()
+        date_from = request.args.get('from', '').strip()
+        date_to = request.args.get('to', '').strip()
+        status = request.args.get('status')
+        
+        if not (ids or date_from or date_to):
+            return jsonify({
+                'success': False,
+                'error': 'Specify ids or a from/to date range'
+            }), 400
+        
+        query = Case.query.options(
+            selectinload(Case.documents),
+            selectinload(Case.status_history)
+        ).filter(Case.deleted_at.is_(None))
+        
+        try:
+            if ids:
+                query = query.filter(Case.id.in_([int(i) for i in ids.split(',') if i.strip()]))
+            if date_from:
+                query = query.filter(Case.created_at >= datetime.strptime(date_from, '%Y-%m-%d'))
+            if date_to:
+                # Inclusive end date
+                query = query.filter(Case.created_at < datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid ids or date (expected YYYY-MM-DD)'
+            }), 400
+        
+        if status:
+            query = query.filter_by(current_status=status)
+        
+        max_cases = current_app.config.get('ARCHIVE_MAX_CASES', 200)
+        cases = query.order_by(Case.created_at).limit(max_cases + 1).all()
+        
+        if not cases:
+            return jsonify({
+                'success': False,
+                'error': 'No cases found'
+            }), 404
+        
+        if len(cases) > max_cases:
+            return jsonify({
+                'success': False,
+                'error': f'Too many cases. Maximum is {max_cases} per archive'
+            }), 400
+        
+        return archive_response(cases, prefix_case_folder=True)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @api_bp.route('/template/blank', methods=['GET'])
+@rate_limited('templates')
 def download_blank_template():
     """
     Download blank Excel template
@@ -377,6 +917,7 @@ def download_blank_template():
     """
     try:
         print("Generating blank template...", flush=True)
+        from app.excel_template import create_blank_template
         template = create_blank_template()
         
         # Ensure pointer is at start
@@ -404,10 +945,11 @@ def get_stats():
     GET /api/stats
     """
     try:
-        total_cases = Case.query.count()
-        draft_cases = Case.query.filter_by(current_status='Draft').count()
-        submitted_cases = Case.query.filter_by(current_status='Submitted').count()
-        approved_cases = Case.query.filter_by(current_status='Approved').count()
+        cases = Case.query.filter(Case.deleted_at.is_(None))
+        total_cases = cases.count()
+        draft_cases = cases.filter_by(current_status='Draft').count()
+        submitted_cases = cases.filter_by(current_status='Submitted').count()
+        approved_cases = cases.filter_by(current_status='Approved').count()
         
         return jsonify({
             'success': True,
@@ -423,3 +965,21 @@ def get_stats():
             'success': False,
             'error': str(e)
         }), 500
+
+
+@api_bp.route('/storage/report', methods=['GET'])
+def get_storage_report():
+    """
+    Get stored bytes per storage tier and bytes reclaimed by compression
+    GET /api/storage/report
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'report': storage_report()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -1,15 +1,26 @@
+import importlib.util
 import os
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 from werkzeug.utils import secure_filename
+from app.storage_tiering import iter_zstd_file
 
-# Try to import SharePoint libraries (optional dependency)
-try:
-    from office365.runtime.auth.authentication_context import AuthenticationContext
-    from office365.sharepoint.client_context import ClientContext
-    SHAREPOINT_AVAILABLE = True
-except ImportError:
-    SHAREPOINT_AVAILABLE = False
+# SharePoint client library (optional dependency); it is slow to import,
+# so it is only located here and imported on first use
+SHAREPOINT_AVAILABLE = importlib.util.find_spec('office365') is not None
+
+
+def load_sharepoint_client():
+    """
+    Import the office365 client classes
+    Returns: (AuthenticationContext, ClientContext)
+    """
+    try:
+        from office365.runtime.auth.authentication_context import AuthenticationContext
+        from office365.sharepoint.client_context import ClientContext
+    except ImportError as e:
+        raise IOError(f"SharePoint client library could not be loaded: {e}")
+    return AuthenticationContext, ClientContext
 
 
 class SharePointService:
@@ -61,12 +72,133 @@ class SharePointService:
         else:
             return f"/storage/{case_number}/{filename}"
     
+    def iter_file(self, file_path: str, from_sharepoint: bool = False,
+                  chunk_size: int = 1024 * 1024, codec: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Stream a stored file in chunks without loading it into memory
+        Compressed (cold tier) local files are decompressed on the fly
+        Raises FileNotFoundError / IOError when the file cannot be read
+        """
+        if from_sharepoint:
+            return self._iter_sharepoint_file(file_path, chunk_size)
+        elif codec == 'zstd':
+            return iter_zstd_file(file_path, chunk_size)
+        elif codec:
+            raise IOError(f"Unsupported storage codec: {codec}")
+        else:
+            return self._iter_local_file(file_path, chunk_size)
+    
+    def iter_document(self, document, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """Stream the original content of a Document from wherever it is stored"""
+        if document.sharepoint_path:
+            return self.iter_file(document.sharepoint_path, True, chunk_size)
+        return self.iter_file(document.local_path, False, chunk_size, document.storage_codec)
+    
+    def delete_file(self, file_path: str, from_sharepoint: bool = False) -> Tuple[bool, Optional[str]]:
+        """
+        Delete a stored file (a file that is already gone counts as deleted)
+        Returns: (success, error_message)
+        """
+        if from_sharepoint:
+            return self._delete_sharepoint_object(file_path, is_folder=False)
+        
+        try:
+            Path(file_path).unlink(missing_ok=True)
+            return True, None
+        except OSError as e:
+            return False, str(e)
+    
+    def delete_document(self, document) -> Tuple[bool, Optional[str]]:
+        """Delete the stored file of a Document from wherever it is stored"""
+        if document.sharepoint_path:
+            return self.delete_file(document.sharepoint_path, True)
+        if document.local_path:
+            return self.delete_file(document.local_path, False)
+        return True, None
+    
+    def delete_case_folder(self, folder_path: str) -> Tuple[bool, Optional[str]]:
+        """
+        Remove a case folder once its documents are gone
+        Local folders are only removed when empty; SharePoint folders go to the recycle bin
+        Returns: (success, error_message)
+        """
+        if folder_path.startswith('Shared Documents/'):
+            return self._delete_sharepoint_object(folder_path, is_folder=True)
+        
+        try:
+            os.rmdir(folder_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Not empty (e.g. files that were never registered): leave it in place
+            print(f"Case folder not removed: {e}", flush=True)
+        return True, None
+    
+    def _delete_sharepoint_object(self, server_relative_url: str, is_folder: bool) -> Tuple[bool, Optional[str]]:
+        """Delete a file / recycle a folder in SharePoint"""
+        if not SHAREPOINT_AVAILABLE or not self.sharepoint_enabled:
+            return False, "SharePoint is not available"
+        
+        try:
+            AuthenticationContext, ClientContext = load_sharepoint_client()
+            ctx_auth = AuthenticationContext(self.site_url)
+            if not ctx_auth.acquire_token_for_user(self.username, self.password):
+                return False, "SharePoint authentication failed"
+            ctx = ClientContext(self.site_url, ctx_auth)
+            
+            if is_folder:
+                ctx.web.get_folder_by_server_relative_url(server_relative_url).recycle()
+            else:
+                ctx.web.get_file_by_server_relative_url(server_relative_url).delete_object()
+            ctx.execute_query()
+            return True, None
+        except Exception as e:
+            response = getattr(e, 'response', None)
+            if response is not None and response.status_code == 404:
+                return True, None
+            return False, str(e)
+    
+    def _iter_sharepoint_file(self, file_path: str, chunk_size: int) -> Iterator[bytes]:
+        """Stream file content from SharePoint"""
+        if not SHAREPOINT_AVAILABLE or not self.sharepoint_enabled:
+            raise IOError("SharePoint is not available")
+        
+        AuthenticationContext, ClientContext = load_sharepoint_client()
+        from office365.runtime.http.http_method import HttpMethod
+        from office365.runtime.http.request_options import RequestOptions
+        
+        ctx_auth = AuthenticationContext(self.site_url)
+        if not ctx_auth.acquire_token_for_user(self.username, self.password):
+            raise IOError("SharePoint authentication failed")
+        ctx = ClientContext(self.site_url, ctx_auth)
+        
+        url = r"{0}/web/getFileByServerRelativePath(DecodedUrl='{1}')/\$value".format(
+            ctx.service_root_url(), file_path
+        )
+        request = RequestOptions(url)
+        request.method = HttpMethod.Get
+        request.stream = True
+        response = ctx.pending_request().execute_request_direct(request)
+        response.raise_for_status()
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                yield chunk
+        finally:
+            response.close()
+    
+    def _iter_local_file(self, file_path: str, chunk_size: int) -> Iterator[bytes]:
+        """Stream file content from local storage"""
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                yield chunk
+    
     def _create_sharepoint_folder(self, case_number: str) -> Tuple[bool, str]:
         """Create folder in SharePoint"""
         if not SHAREPOINT_AVAILABLE:
             return self._create_local_folder(case_number)
         
         try:
+            AuthenticationContext, ClientContext = load_sharepoint_client()
             ctx_auth = AuthenticationContext(self.site_url)
             if ctx_auth.acquire_token_for_user(self.username, self.password):
                 ctx = ClientContext(self.site_url, ctx_auth)
@@ -102,6 +234,7 @@ class SharePointService:
             return self._upload_to_local(case_number, file, filename)
         
         try:
+            AuthenticationContext, ClientContext = load_sharepoint_client()
             ctx_auth = AuthenticationContext(self.site_url)
             if ctx_auth.acquire_token_for_user(self.username, self.password):
                 ctx = ClientContext(self.site_url, ctx_auth)
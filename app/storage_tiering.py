@@ -0,0 +1,217 @@
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from app.models import db, Case, Document, StatusHistory
+from app.archive_service import is_precompressed, STORED_EXTENSIONS, STORED_MIME_PREFIXES
+
+# Try to import zstandard (optional dependency)
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Statuses after which a case no longer changes
+CLOSED_STATUSES = ['Closed', 'Rejected']
+
+# Keep the original when compression saves less than this fraction
+MIN_SAVING_RATIO = 0.1
+
+
+def iter_zstd_file(file_path: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Stream-decompress a zstd file in chunks"""
+    if not ZSTD_AVAILABLE:
+        raise IOError("zstandard is not installed")
+
+    with open(file_path, 'rb') as f:
+        decompressor = zstandard.ZstdDecompressor()
+        for chunk in decompressor.read_to_iter(f, read_size=chunk_size, write_size=chunk_size):
+            yield chunk
+
+
+def compress_file(source: Path, target: Path, level: int) -> int:
+    """
+    Compress source into target with zstd (streaming, constant memory)
+    Returns: size of the compressed file
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_target = target.with_name(target.name + '.tmp')
+
+    compressor = zstandard.ZstdCompressor(level=level, write_checksum=True)
+    with open(source, 'rb') as src, open(tmp_target, 'wb') as dst:
+        compressor.copy_stream(src, dst, size=source.stat().st_size)
+        dst.flush()
+        os.fsync(dst.fileno())
+
+    os.replace(tmp_target, target)
+    return target.stat().st_size
+
+
+def _precompressed_clause():
+    """SQL version of is_precompressed() so skipped formats never use up a LIMIT"""
+    filename = db.func.lower(Document.filename)
+    mime_type = db.func.coalesce(Document.mime_type, '')
+    return db.or_(
+        *[filename.like(f'%{ext}') for ext in sorted(STORED_EXTENSIONS)],
+        *[mime_type.like(f'{prefix}%') for prefix in STORED_MIME_PREFIXES]
+    )
+
+
+def find_cold_documents(closed_before: datetime, limit: int = None):
+    """
+    Raw (uncompressed) local documents of cases that were closed/rejected
+    before the given time, excluding compressed formats and files already
+    found not worth compressing
+    """
+    closed_at = db.session.query(
+        StatusHistory.case_id,
+        db.func.max(StatusHistory.changed_at).label('closed_at')
+    ).filter(
+        StatusHistory.new_status.in_(CLOSED_STATUSES)
+    ).group_by(StatusHistory.case_id).subquery()
+
+    query = Document.query.join(Case).join(
+        closed_at, closed_at.c.case_id == Case.id
+    ).filter(
+        Case.current_status.in_(CLOSED_STATUSES),
+        closed_at.c.closed_at < closed_before,
+        Document.local_path.isnot(None),
+        Document.sharepoint_path.is_(None),
+        Document.storage_codec.is_(None),
+        Document.tier_checked_at.is_(None),
+        Document.deleted_at.is_(None),
+        Case.deleted_at.is_(None),
+        ~_precompressed_clause()
+    ).order_by(Document.id)
+
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def tier_cold_documents(config, older_than_days: int = None, dry_run: bool = False,
+                        limit: int = None) -> dict:
+    """
+    Move documents of long-closed cases into the compressed cold tier
+    Compressible files are written as zstd into COLD_STORAGE_PATH and the
+    Document path is updated; already-compressed formats are left in place.
+    Rows sharing the same local file (a filename re-uploaded into the case)
+    are repointed together so the hot copy is only dropped once unused.
+    Returns: report dict (counts and bytes reclaimed)
+    """
+    if not ZSTD_AVAILABLE:
+        raise RuntimeError("zstandard is not installed")
+
+    if older_than_days is None:
+        older_than_days = config.get('COLD_TIER_AFTER_DAYS', 90)
+    cold_path = Path(config.get('COLD_STORAGE_PATH', './instance/cold'))
+    level = config.get('COLD_TIER_ZSTD_LEVEL', 10)
+
+    report = {
+        'candidates': 0,
+        'eligible': 0,
+        'bytes_eligible': 0,
+        'compressed': 0,
+        'skipped_precompressed': 0,
+        'skipped_low_ratio': 0,
+        'missing': 0,
+        'errors': 0,
+        'bytes_before': 0,
+        'bytes_after': 0,
+        'bytes_reclaimed': 0,
+        'dry_run': dry_run
+    }
+
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    documents = find_cold_documents(cutoff, limit)
+    report['candidates'] = len(documents)
+
+    for document in documents:
+        # Already handled together with a row that shares its file
+        if document.storage_codec or document.tier_checked_at:
+            continue
+
+        source = Path(document.local_path)
+
+        if is_precompressed(document.filename, document.mime_type):
+            report['skipped_precompressed'] += 1
+            continue
+
+        if not source.exists():
+            report['missing'] += 1
+            continue
+
+        original_size = source.stat().st_size
+        report['eligible'] += 1
+        report['bytes_eligible'] += original_size
+        if dry_run:
+            continue
+
+        target = cold_path / document.case.case_number / f"{document.id}_{document.filename}.zst"
+        try:
+            stored_size = compress_file(source, target, level)
+        except Exception as e:
+            print(f"Cold tier error for document {document.id}: {e}", flush=True)
+            report['errors'] += 1
+            continue
+
+        sharing = Document.query.filter(
+            Document.local_path == document.local_path,
+            Document.id != document.id
+        ).all()
+
+        if stored_size > original_size * (1 - MIN_SAVING_RATIO):
+            target.unlink(missing_ok=True)
+            # Remember the result so later runs do not compress it again
+            for row in [document] + sharing:
+                row.tier_checked_at = datetime.utcnow()
+            db.session.commit()
+            report['skipped_low_ratio'] += 1
+            continue
+
+        for row in [document] + sharing:
+            row.local_path = str(target)
+            row.storage_codec = 'zstd'
+            row.stored_size = stored_size
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            target.unlink(missing_ok=True)
+            print(f"Cold tier error for document {document.id}: {e}", flush=True)
+            report['errors'] += 1
+            continue
+
+        # Only drop the hot copy once the database points at the cold one
+        source.unlink(missing_ok=True)
+
+        report['compressed'] += 1
+        report['bytes_before'] += original_size
+        report['bytes_after'] += stored_size
+
+    report['bytes_reclaimed'] = report['bytes_before'] - report['bytes_after']
+    return report
+
+
+def storage_report() -> dict:
+    """Storage usage per tier, computed from the Document table"""
+    rows = db.session.query(
+        Document.storage_codec,
+        db.func.count(Document.id),
+        db.func.coalesce(db.func.sum(Document.file_size), 0),
+        db.func.coalesce(db.func.sum(db.func.coalesce(Document.stored_size, Document.file_size)), 0)
+    ).group_by(Document.storage_codec).all()
+
+    report = {'tiers': {}, 'bytes_original': 0, 'bytes_stored': 0}
+    for codec, count, original, stored in rows:
+        report['tiers'][codec or 'raw'] = {
+            'documents': count,
+            'bytes_original': int(original),
+            'bytes_stored': int(stored)
+        }
+        report['bytes_original'] += int(original)
+        report['bytes_stored'] += int(stored)
+    report['bytes_reclaimed'] = report['bytes_original'] - report['bytes_stored']
+    return report
@@ -0,0 +1,260 @@
+import hashlib
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Tuple
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.utils import secure_filename
+
+from app.models import db, Case, Document, UploadSession
+from app.sharepoint_service import SharePointService
+
+# Size of each read from the request stream / staging file
+COPY_BUFFER_SIZE = 64 * 1024
+
+_executor = None
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Shared executor for background assembly"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upload-assembly')
+    return _executor
+
+
+class ChunkedUploadService:
+    """
+    Resumable upload service
+    Chunks are appended to a staging file; a background step assembles
+    and verifies the document before the Document row is created
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.staging_path = Path(config.get('UPLOAD_STAGING_PATH', './instance/uploads'))
+        self.chunk_max_size = config.get('UPLOAD_CHUNK_MAX_SIZE', 8 * 1024 * 1024)
+        self.max_total_size = config.get('MAX_CONTENT_LENGTH')
+        self.session_ttl = timedelta(hours=config.get('UPLOAD_SESSION_TTL_HOURS', 24))
+        self.assembly_workers = config.get('UPLOAD_ASSEMBLY_WORKERS', 2)
+        self.assembly_timeout = timedelta(minutes=config.get('UPLOAD_ASSEMBLY_TIMEOUT_MINUTES', 30))
+
+        # Ensure staging folder exists
+        self.staging_path.mkdir(parents=True, exist_ok=True)
+
+    def staging_file(self, upload_id: str) -> Path:
+        """Path of the staging file for an upload session"""
+        return self.staging_path / f"{upload_id}.part"
+
+    def create_session(self, case: Case, original_filename: str, total_size: int,
+                       doc_type: str, mime_type: Optional[str] = None,
+                       checksum: Optional[str] = None,
+                       notes: Optional[str] = None) -> Tuple[Optional[UploadSession], Optional[str]]:
+        """
+        Create a new upload session and its empty staging file
+        Returns: (upload_session, error_message)
+        """
+        safe_filename = secure_filename(original_filename)
+        if not safe_filename:
+            return None, 'Invalid filename. Please use ASCII characters.'
+
+        if total_size < 0:
+            return None, 'total_size must be a non-negative integer'
+
+        if self.max_total_size and total_size > self.max_total_size:
+            return None, f'File too large. Maximum size is {self.max_total_size} bytes'
+
+        if checksum and (len(checksum) != 64 or any(c not in '0123456789abcdefABCDEF' for c in checksum)):
+            return None, 'checksum must be a SHA-256 hex digest'
+
+        upload = UploadSession(
+            id=uuid.uuid4().hex,
+            case_id=case.id,
+            doc_type=doc_type,
+            original_filename=original_filename,
+            filename=safe_filename,
+            mime_type=mime_type,
+            total_size=total_size,
+            received_size=0,
+            checksum=checksum.lower() if checksum else None,
+            notes=notes
+        )
+        self.staging_file(upload.id).touch()
+        return upload, None
+
+    def append_chunk(self, upload: UploadSession, offset: int, stream) -> Tuple[bool, Optional[str]]:
+        """
+        Append a chunk read from stream at the given offset
+        Returns: (success, error_message)
+        Raises: RequestEntityTooLarge when the chunk exceeds chunk_max_size
+        """
+        if upload.status != 'Uploading':
+            return False, f'Upload is {upload.status}'
+
+        if offset != upload.received_size:
+            return False, f'Offset mismatch. Expected {upload.received_size}'
+
+        staging = self.staging_file(upload.id)
+        remaining = upload.total_size - upload.received_size
+        limit = min(self.chunk_max_size, remaining)
+
+        with open(staging, 'r+b' if staging.exists() else 'w+b') as f:
+            # Drop any bytes from an interrupted chunk that was never committed
+            f.truncate(upload.received_size)
+            f.seek(upload.received_size)
+
+            written = 0
+            while True:
+                block = stream.read(COPY_BUFFER_SIZE)
+                if not block:
+                    break
+                if written + len(block) > limit:
+                    f.truncate(upload.received_size)
+                    raise RequestEntityTooLarge(f'Chunk exceeds limit of {limit} bytes')
+                f.write(block)
+                written += len(block)
+
+        upload.received_size += written
+        return True, None
+
+    def abort(self, upload: UploadSession):
+        """Discard the staging file of an upload session"""
+        self.staging_file(upload.id).unlink(missing_ok=True)
+
+    def is_stale(self, upload: UploadSession) -> bool:
+        """An assembly that has not finished within the timeout (its worker is gone)"""
+        return (upload.status == 'Assembling'
+                and upload.updated_at < datetime.utcnow() - self.assembly_timeout)
+    
+    def fail_stale(self, upload: UploadSession):
+        """Mark a stale assembly as Failed and discard its staging file (not committed)"""
+        upload.status = 'Failed'
+        upload.error = 'Assembly did not finish. Please upload the file again.'
+        self.abort(upload)
+    
+    def purge_expired_sessions(self) -> int:
+        """
+        Fail stale assemblies, then remove unfinished sessions older than the TTL
+        together with their staging files
+        Returns: number of sessions removed
+        """
+        stale = UploadSession.query.filter(
+            UploadSession.status == 'Assembling',
+            UploadSession.updated_at < datetime.utcnow() - self.assembly_timeout
+        ).all()
+        for upload in stale:
+            self.fail_stale(upload)
+        
+        cutoff = datetime.utcnow() - self.session_ttl
+        expired = UploadSession.query.filter(
+            UploadSession.status.in_(['Uploading', 'Failed']),
+            UploadSession.updated_at < cutoff
+        ).all()
+        for upload in expired:
+            self.abort(upload)
+            db.session.delete(upload)
+        return len(expired)
+
+    def start_assembly(self, app, upload_id: str):
+        """Schedule background assembly of a fully received upload"""
+        _get_executor(self.assembly_workers).submit(assemble_upload, app, upload_id)
+
+
+def verify_staging_file(path: Path, total_size: int,
+                        checksum: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Verify size and (optionally) SHA-256 of a staging file
+    Returns: (sha256, error_message)
+    """
+    if not path.exists():
+        return None, 'Staging file is missing'
+
+    if path.stat().st_size != total_size:
+        return None, f'Size mismatch: expected {total_size}, got {path.stat().st_size}'
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(COPY_BUFFER_SIZE), b''):
+            digest.update(block)
+
+    if checksum and digest.hexdigest() != checksum:
+        return None, 'Checksum mismatch'
+
+    return digest.hexdigest(), None
+
+
+def assemble_upload(app, upload_id: str):
+    """
+    Background step: verify the staging file, move it into storage
+    and create the Document row
+    """
+    with app.app_context():
+        upload = db.session.get(UploadSession, upload_id)
+        if upload is None or upload.status != 'Assembling':
+            return
+
+        service = ChunkedUploadService(app.config)
+        staging = service.staging_file(upload.id)
+
+        try:
+            sha256, error = verify_staging_file(staging, upload.total_size, upload.checksum)
+
+            if not error and upload.doc_type == 'main':
+                existing_main = Document.query.filter_by(
+                    case_id=upload.case_id,
+                    doc_type='main',
+                    deleted_at=None
+                ).first()
+                if existing_main:
+                    error = 'Main document already exists. Please delete it first or upload as attachment.'
+
+            if error:
+                upload.status = 'Failed'
+                upload.error = error
+                db.session.commit()
+                return
+
+            case = db.session.get(Case, upload.case_id)
+            sp_service = SharePointService(app.config)
+
+            with open(staging, 'rb') as f:
+                file = FileStorage(stream=f, filename=upload.filename, content_type=upload.mime_type)
+                success, file_path, error = sp_service.upload_file(case.case_number, file, upload.filename)
+
+            if not success:
+                upload.status = 'Failed'
+                upload.error = error or 'Failed to upload file'
+                db.session.commit()
+                return
+
+            document = Document(
+                case_id=upload.case_id,
+                doc_type=upload.doc_type,
+                filename=upload.filename,
+                original_filename=upload.original_filename,
+                file_size=upload.total_size,
+                mime_type=upload.mime_type,
+                sha256=sha256,
+                sharepoint_path=file_path if sp_service.sharepoint_enabled else None,
+                local_path=file_path if not sp_service.sharepoint_enabled else None,
+                notes=upload.notes
+            )
+            db.session.add(document)
+            db.session.flush()
+
+            upload.document_id = document.id
+            upload.status = 'Completed'
+            case.updated_at = datetime.utcnow()
+
+            db.session.commit()
+            service.abort(upload)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Upload assembly error: {e}", flush=True)
+            upload = db.session.get(UploadSession, upload_id)
+            if upload is not None:
+                upload.status = 'Failed'
+                upload.error = str(e)
+                db.session.commit()
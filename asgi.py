@@ -0,0 +1,6 @@
+from app import create_app
+from app.asgi_app import create_asgi_app
+import os
+
+# Serve with an ASGI server, e.g.: uvicorn asgi:app --workers 2
+app = create_asgi_app(create_app(os.getenv('FLASK_ENV', 'default')))
@@ -13,18 +13,81 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         f'sqlite:///{basedir / "instance" / "cdc_pr.db"}'
     
+    # Read replica (optional): GET requests read from it, writes go to the primary
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL', '')
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+    REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', 5))
+    REPLICA_READ_YOUR_WRITES_SECONDS = int(os.environ.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10))
+    REPLICA_LAG_QUERY = os.environ.get('REPLICA_LAG_QUERY')  # SQL returning lag in seconds
+    
     # SharePoint
     SHAREPOINT_SITE_URL = os.environ.get('SHAREPOINT_SITE_URL', '')
     SHAREPOINT_USERNAME = os.environ.get('SHAREPOINT_USERNAME', '')
     SHAREPOINT_PASSWORD = os.environ.get('SHAREPOINT_PASSWORD', '')
     SHAREPOINT_ROOT_FOLDER = os.environ.get('SHAREPOINT_ROOT_FOLDER', 'CDC-PR-Cases')
     
+    # Async storage client (ASGI entry point, asgi.py)
+    ASYNC_STORAGE_CONCURRENCY = int(os.environ.get('ASYNC_STORAGE_CONCURRENCY', 100))
+    SHAREPOINT_TIMEOUT = int(os.environ.get('SHAREPOINT_TIMEOUT', 60))
+    SHAREPOINT_AUTH_TTL = int(os.environ.get('SHAREPOINT_AUTH_TTL', 1800))
+    
     # Application
     CASE_NUMBER_PREFIX = os.environ.get('CASE_NUMBER_PREFIX', 'CDC-PR')
     MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB max file size
     
+    # Soft delete retention: deleted cases/documents are purged after N days
+    DELETED_RETENTION_DAYS = int(os.environ.get('DELETED_RETENTION_DAYS', 30))
+    PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE', 200))
+    PURGE_WORKERS = int(os.environ.get('PURGE_WORKERS', 4))
+    PURGE_BATCH_PAUSE = 0.05  # Seconds between batches so other writers get the SQLite lock
+    
+    # Startup budget enforced by `flask profile-startup` (0 disables the check)
+    STARTUP_MAX_IMPORT_MS = float(os.environ.get('STARTUP_MAX_IMPORT_MS', 1500))
+    
+    # Rate limiting and admission control (per process)
+    # rate/burst: token bucket per client; per_client_concurrency / concurrency:
+    # in-flight caps per client and for the whole class
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    RATE_LIMIT_TRUST_PROXY = os.environ.get('RATE_LIMIT_TRUST_PROXY', 'False').lower() == 'true'
+    RATE_LIMITS = {
+        'uploads': {'rate': 5, 'burst': 30, 'per_client_concurrency': 2, 'concurrency': 8},
+        # ASGI upload endpoint: storage calls are awaited, so one worker can hold many
+        'async_uploads': {'rate': 5, 'burst': 30, 'per_client_concurrency': 10,
+                          'concurrency': ASYNC_STORAGE_CONCURRENCY},
+        'templates': {'rate': 1, 'burst': 5, 'per_client_concurrency': 1, 'concurrency': 4},
+        'archives': {'rate': 0.1, 'burst': 2, 'per_client_concurrency': 1, 'concurrency': 2},
+        'search': {'rate': 10, 'burst': 30, 'per_client_concurrency': 4, 'concurrency': 16}
+    }
+    
+    # Response compression (gzip, or brotli when installed)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BR_LEVEL = 5
+    
     # Local storage fallback (when SharePoint is not configured)
     LOCAL_STORAGE_PATH = basedir / "instance" / "storage"
+    
+    # Resumable (chunked) uploads
+    UPLOAD_STAGING_PATH = basedir / "instance" / "uploads"
+    UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get('UPLOAD_CHUNK_MAX_SIZE', 8 * 1024 * 1024))  # 8MB per PUT
+    UPLOAD_SESSION_TTL_HOURS = int(os.environ.get('UPLOAD_SESSION_TTL_HOURS', 24))
+    UPLOAD_ASSEMBLY_WORKERS = int(os.environ.get('UPLOAD_ASSEMBLY_WORKERS', 2))
+    # Assembling sessions older than this are treated as lost (e.g. worker restarted)
+    UPLOAD_ASSEMBLY_TIMEOUT_MINUTES = int(os.environ.get('UPLOAD_ASSEMBLY_TIMEOUT_MINUTES', 30))
+    
+    # Multi-case ZIP archive download
+    ARCHIVE_MAX_CASES = int(os.environ.get('ARCHIVE_MAX_CASES', 200))
+    
+    # Cold storage tier (zstd-compressed documents of long-closed cases)
+    COLD_STORAGE_PATH = basedir / "instance" / "cold"
+    COLD_TIER_AFTER_DAYS = int(os.environ.get('COLD_TIER_AFTER_DAYS', 90))
+    COLD_TIER_ZSTD_LEVEL = int(os.environ.get('COLD_TIER_ZSTD_LEVEL', 10))
+    
+    # Integrity scrubber
+    SCRUB_WORKERS = int(os.environ.get('SCRUB_WORKERS', 2))
+    SCRUB_MAX_MB_PER_SEC = float(os.environ.get('SCRUB_MAX_MB_PER_SEC', 20))
 
 
 class DevelopmentConfig(Config):